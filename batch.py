@@ -0,0 +1,104 @@
+"""
+Batch decay analysis for many parent nuclides.
+
+Each root is built into a decay DAG, its optimal path is searched, and the result comes back as a plain dict
+record. Roots are fanned out over a concurrent.futures process pool whose workers warm the nuclide index and
+Q-value table once, when they start (parallel_build.warm_worker), and build one transition table on their first
+task that every later task reuses.
+
+Usage:
+    python batch.py roots.txt [--processes N] [--objective final_be|fewest_steps|max_q]
+where each line of roots.txt is "symbol Z A" (commas also accepted). Records are printed as JSON lines.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from decay_tree import Tree, check_element_exists
+from parallel_build import warm_worker
+from transition_table import TransitionTable
+
+_transitions = None
+
+
+def get_transitions():
+    """
+    Returns the transition table of this process, built on the first call.
+    """
+    global _transitions
+    if _transitions is None:
+        _transitions = TransitionTable()
+    return _transitions
+
+
+def analyse(symbol, atomic_number, mass_number, objective="final_be"):
+    """
+    Builds the decay DAG and optimal path for one root and returns them as a record:
+        {"symbol", "atomic_number", "mass_number", "valid", "nodes", "max_depth", "path"}
+    where path is a list of [symbol, Z, A, binding energy per nucleon]. Invalid roots get valid=False.
+    """
+    record = {"symbol": symbol, "atomic_number": atomic_number, "mass_number": mass_number, "valid": False,
+              "nodes": 0, "max_depth": 0, "path": []}
+    if not check_element_exists(symbol, atomic_number, mass_number):
+        return record
+
+    tree = Tree(transitions=get_transitions())
+    tree.root = tree.build_tree(symbol, atomic_number, mass_number, dag=True)
+    path = tree.find_optimal_path(tree.root, objective)
+    record.update(valid=True, nodes=tree.node_counter, max_depth=tree.max_depth,
+                  path=[[node.value.symbol.value, node.value.atomic_number.value, node.value.mass_number.value,
+                         node.value.binding_energy.value] for node in path])
+    return record
+
+
+def _analyse_task(args):
+    return analyse(*args)
+
+
+def read_roots(filepath):
+    """
+    Reads "symbol Z A" lines (whitespace or comma separated, '#' starts a comment) into a list of tuples.
+    """
+    roots = []
+    with open(filepath) as f:
+        for line in f:
+            line = line.split("#")[0].replace(",", " ").split()
+            if line:
+                roots.append((line[0], int(line[1]), int(line[2])))
+    return roots
+
+
+def run_batch(roots, processes=None, objective="final_be", chunksize=8):
+    """
+    Analyses every (symbol, Z, A) root and returns (records, throughput) with throughput in nuclides per second.
+    Records are in the same order as roots. processes=1 runs everything in this process.
+    """
+    start = time.perf_counter()
+    tasks = [(symbol, atomic_number, mass_number, objective) for symbol, atomic_number, mass_number in roots]
+    if processes == 1:
+        warm_worker()
+        records = [_analyse_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=warm_worker) as pool:
+            records = list(pool.map(_analyse_task, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    return records, len(roots) / elapsed if elapsed > 0 else float("inf")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch decay analysis of many parent nuclides")
+    parser.add_argument("roots", help="file with one 'symbol Z A' root per line")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--objective", default="final_be", choices=["final_be", "fewest_steps", "max_q"])
+    args = parser.parse_args(argv)
+
+    records, throughput = run_batch(read_roots(args.roots), args.processes, args.objective)
+    for record in records:
+        print(json.dumps(record))
+    print(f"{len(records)} nuclides, {throughput:.1f} nuclides/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import csv
+from collections import deque
+
+import numpy as np
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+YEAR = 365.25 * DAY
+
+# Half-lives in seconds for the nuclides that appear in the common heavy-element chains built by Tree.
+# A nuclide that decays further in the built network must be found here or in the caller's half_lives; one
+# without daughters (the end of a chain) that is found in neither is treated as stable. Tree also follows decays
+# nature does not (any step that raises the binding energy per nucleon), so many chains of the transuranium
+# elements reach nuclides missing here: missing_half_lives lists them before a solver is built.
+HALF_LIVES = {
+    (98, 252): 2.645 * YEAR,      # Cf-252
+    (96, 248): 3.48e5 * YEAR,     # Cm-248
+    (95, 241): 432.2 * YEAR,      # Am-241
+    (94, 244): 8.00e7 * YEAR,     # Pu-244
+    (94, 239): 2.411e4 * YEAR,    # Pu-239
+    (93, 237): 2.144e6 * YEAR,    # Np-237
+    (92, 240): 14.1 * HOUR,       # U-240
+    (92, 238): 4.468e9 * YEAR,    # U-238
+    (92, 235): 7.04e8 * YEAR,     # U-235
+    (92, 234): 2.455e5 * YEAR,    # U-234
+    (90, 236): 37.3 * MINUTE,     # Th-236
+    (90, 234): 24.10 * DAY,       # Th-234
+    (90, 232): 1.405e10 * YEAR,   # Th-232
+    (90, 230): 7.538e4 * YEAR,    # Th-230
+    (89, 232): 119.0,             # Ac-232
+    (88, 232): 250.0,             # Ra-232
+    (88, 230): 93.0 * MINUTE,     # Ra-230
+    (88, 228): 5.75 * YEAR,       # Ra-228
+    (88, 226): 1600.0 * YEAR,     # Ra-226
+    (87, 228): 38.0,              # Fr-228
+    (86, 228): 65.0,              # Rn-228
+    (86, 226): 7.4 * MINUTE,      # Rn-226
+    (86, 224): 107.0 * MINUTE,    # Rn-224
+    (86, 222): 3.8235 * DAY,      # Rn-222
+    (84, 210): 138.376 * DAY,     # Po-210
+    (82, 210): 22.20 * YEAR,      # Pb-210
+    # the other members of the natural (4n, 4n+1, 4n+2, 4n+3) series and their neighbours that Tree reaches
+    (98, 251): 898.0 * YEAR,      # Cf-251
+    (98, 250): 13.08 * YEAR,      # Cf-250
+    (98, 249): 351.0 * YEAR,      # Cf-249
+    (97, 249): 330.0 * DAY,       # Bk-249
+    (96, 247): 1.56e7 * YEAR,     # Cm-247
+    (96, 246): 4706.0 * YEAR,     # Cm-246
+    (95, 243): 7370.0 * YEAR,     # Am-243
+    (94, 243): 4.956 * HOUR,      # Pu-243
+    (94, 242): 3.75e5 * YEAR,     # Pu-242
+    (94, 241): 14.29 * YEAR,      # Pu-241
+    (93, 239): 2.356 * DAY,       # Np-239
+    (92, 239): 23.45 * MINUTE,    # U-239
+    (92, 237): 6.75 * DAY,        # U-237
+    (91, 235): 24.4 * MINUTE,     # Pa-235
+    (91, 233): 26.98 * DAY,       # Pa-233
+    (91, 231): 3.276e4 * YEAR,    # Pa-231
+    (90, 235): 7.2 * MINUTE,      # Th-235
+    (90, 233): 21.83 * MINUTE,    # Th-233
+    (90, 231): 25.52 * HOUR,      # Th-231
+    (90, 229): 7932.0 * YEAR,     # Th-229
+    (90, 227): 18.68 * DAY,       # Th-227
+    (89, 231): 7.5 * MINUTE,      # Ac-231
+    (89, 229): 62.7 * MINUTE,     # Ac-229
+    (89, 227): 21.77 * YEAR,      # Ac-227
+    (89, 225): 9.92 * DAY,        # Ac-225
+    (88, 231): 103.0,             # Ra-231
+    (88, 229): 4.0 * MINUTE,      # Ra-229
+    (88, 227): 42.2 * MINUTE,     # Ra-227
+    (88, 225): 14.9 * DAY,        # Ra-225
+    (88, 224): 3.66 * DAY,        # Ra-224
+    (88, 223): 11.43 * DAY,       # Ra-223
+    (87, 227): 2.47 * MINUTE,     # Fr-227
+    (87, 225): 3.95 * MINUTE,     # Fr-225
+    (87, 223): 22.0 * MINUTE,     # Fr-223
+    (87, 221): 4.9 * MINUTE,      # Fr-221
+    (86, 227): 20.2,              # Rn-227
+    (86, 225): 4.66 * MINUTE,     # Rn-225
+    (86, 223): 24.3 * MINUTE,     # Rn-223
+    (86, 221): 25.7 * MINUTE,     # Rn-221
+    (86, 220): 55.6,              # Rn-220
+    (86, 219): 3.96,              # Rn-219
+    (86, 218): 35e-3,             # Rn-218
+    (85, 223): 50.0,              # At-223
+    (85, 221): 2.3 * MINUTE,      # At-221
+    (85, 219): 56.0,              # At-219
+    (85, 218): 1.5,               # At-218
+    (85, 217): 32.3e-3,           # At-217
+    (84, 218): 3.098 * MINUTE,    # Po-218
+    (84, 217): 1.53,              # Po-217
+    (84, 216): 0.145,             # Po-216
+    (84, 215): 1.781e-3,          # Po-215
+    (84, 214): 164.3e-6,          # Po-214
+    (84, 213): 3.72e-6,           # Po-213
+    (84, 212): 0.299e-6,          # Po-212
+    (83, 215): 7.6 * MINUTE,      # Bi-215
+    (83, 214): 19.9 * MINUTE,     # Bi-214
+    (83, 213): 45.6 * MINUTE,     # Bi-213
+    (83, 212): 60.55 * MINUTE,    # Bi-212
+    (83, 211): 2.14 * MINUTE,     # Bi-211
+    (83, 210): 5.012 * DAY,       # Bi-210
+    (82, 214): 26.8 * MINUTE,     # Pb-214
+    (82, 213): 10.2 * MINUTE,     # Pb-213
+    (82, 212): 10.64 * HOUR,      # Pb-212
+    (82, 211): 36.1 * MINUTE,     # Pb-211
+    (82, 209): 3.253 * HOUR,      # Pb-209
+    (82, 208): float("inf"),      # Pb-208, stable
+    (82, 207): float("inf"),      # Pb-207, stable
+    (82, 206): float("inf"),      # Pb-206, stable
+    (81, 210): 1.30 * MINUTE,     # Tl-210
+    (81, 209): 2.16 * MINUTE,     # Tl-209
+    (81, 208): 3.053 * MINUTE,    # Tl-208
+    (81, 207): 4.77 * MINUTE,     # Tl-207
+    (81, 206): 4.20 * MINUTE,     # Tl-206
+    (80, 208): 42.0 * MINUTE,     # Hg-208
+    (80, 207): 2.9 * MINUTE,      # Hg-207
+    (80, 206): 8.32 * MINUTE,     # Hg-206
+    (80, 205): 5.14 * MINUTE,     # Hg-205
+}
+
+
+def _children(node):
+    # TreeNode (main_2.Tree, tree or DAG) and GraphNode (updated_project.NuclearGraph) both work
+    if hasattr(node, "decay_products"):
+        return node.decay_products
+    return [child for child in node.children if child is not None]
+
+
+def _nuclide(node):
+    if hasattr(node, "decay_products"):
+        element, atomic_number, mass_number = node.value
+        return str(element).split(" ")[-1], atomic_number, mass_number
+    return node.value.symbol.value, node.value.atomic_number.value, node.value.mass_number.value
+
+
+def decay_network(root):
+    """
+    Collapses a built decay tree (or DAG) into its distinct nuclides and parent -> daughter edges.
+    A nuclide reached along several paths is a single species, so duplicated subtrees are merged.
+    Returns (nuclides, edges): nuclides maps (Z, A) -> symbol in discovery order, edges is a list of
+    ((Z, A) parent, (Z, A) daughter) without repeats.
+    Time Complexity: O(n) in the number of tree nodes
+    """
+    nuclides = {}
+    edges = {}
+    seen = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        symbol, atomic_number, mass_number = _nuclide(node)
+        nuclides.setdefault((atomic_number, mass_number), symbol)
+        for child in _children(node):
+            _, child_z, child_a = _nuclide(child)
+            edges[((atomic_number, mass_number), (child_z, child_a))] = None
+            stack.append(child)
+    return nuclides, list(edges)
+
+
+OUTSIDE = "outside"          # label of the sink species of DecayChain
+
+
+def missing_half_lives(root, half_lives=None):
+    """
+    Returns the labels ("Po-218") of the nuclides of a built chain that decay further but have no half-life in
+    HALF_LIVES or half_lives. DecayChain (and so BatemanSolver and MonteCarloSimulation) rejects chains for which
+    this is not empty.
+    """
+    nuclides, edges = decay_network(root)
+    table = half_lives or {}
+    return [f"{nuclides[key]}-{key[1]}" for key in dict.fromkeys(parent for parent, _ in edges)
+            if key not in HALF_LIVES and key not in table]
+
+
+class DecayChain:
+    """
+    The distinct nuclides of a built decay tree in topological order (root first), with their decay constants
+    and branching fractions. Shared by the Bateman solver and the Monte Carlo simulation.
+
+    half_lives overrides/extends HALF_LIVES ((Z, A) -> seconds, float("inf") for stable). branching maps
+    (parent (Z, A), daughter (Z, A)) to a branching fraction. Fractions are taken as given; daughters without an
+    explicit fraction share what is left of their parent's decays equally.
+    fractions[d, p] is the fraction of decays of nuclide p that produce nuclide d.
+
+    The last species, labelled OUTSIDE (key None), is a sink: it receives every decay that does not produce a
+    nuclide of the network (decays of a radioactive end of a chain, branches with fractions below 1), so the total
+    number of atoms is conserved.
+    Raises ValueError if a nuclide with daughters has no half-life or its fractions add up to more than 1.
+    """
+    def __init__(self, root, half_lives=None, branching=None):
+        nuclides, edges = decay_network(root)
+        table = dict(HALF_LIVES)
+        table.update(half_lives or {})
+
+        daughters = {}
+        for parent, daughter in edges:
+            daughters.setdefault(parent, []).append(daughter)
+        missing = [f"{nuclides[key]}-{key[1]}" for key in daughters if key not in table]
+        if missing:
+            symbol, (_, mass_number) = next(iter(nuclides.values())), next(iter(nuclides))
+            raise ValueError(f"The decay chain of {symbol}-{mass_number} is not supported: no half-life for "
+                             f"{', '.join(missing)}. Pass them in half_lives (float('inf') if stable)")
+
+        self.keys = self._topological_order(list(nuclides), edges) + [None]
+        self.labels = [f"{nuclides[key]}-{key[1]}" for key in self.keys[:-1]] + [OUTSIDE]
+        position = {key: i for i, key in enumerate(self.keys)}
+        n = len(self.keys)
+
+        self.decay_constants = np.array([np.log(2) / table[key] if key in table else 0.0
+                                         for key in self.keys[:-1]] + [0.0])
+
+        branching = branching or {}
+        self.fractions = np.zeros((n, n))
+        for parent, children in daughters.items():
+            given = [branching[(parent, daughter)] for daughter in children if (parent, daughter) in branching]
+            share = (1.0 - sum(given)) / (len(children) - len(given)) if len(given) < len(children) else 0.0
+            for daughter in children:
+                self.fractions[position[daughter], position[parent]] = branching.get((parent, daughter), share)
+        for parent in range(n - 1):
+            rest = 1.0 - self.fractions[:, parent].sum()
+            if rest < -1e-12:
+                raise ValueError(f"Branching fractions of {self.labels[parent]} add up to more than 1")
+            if rest > 1e-12:
+                self.fractions[n - 1, parent] = rest
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def _topological_order(keys, edges):
+        # Kahn's algorithm; keys[0] is the root and stays first
+        indegree = {key: 0 for key in keys}
+        daughters = {key: [] for key in keys}
+        for parent, daughter in edges:
+            daughters[parent].append(daughter)
+            indegree[daughter] += 1
+        ready = deque(key for key in keys if indegree[key] == 0)
+        order = []
+        while ready:
+            key = ready.popleft()
+            order.append(key)
+            for daughter in daughters[key]:
+                indegree[daughter] -= 1
+                if indegree[daughter] == 0:
+                    ready.append(daughter)
+        if len(order) != len(keys):
+            raise ValueError("Decay network contains a cycle")
+        return order
+
+
+class BatemanSolver:
+    """
+    Solves the Bateman equations dN/dt = M N over a decay chain built by Tree.build_tree or
+    NuclearGraph.build_decay_tree, starting from initial_atoms of the root nuclide.
+
+    M is lower triangular once the nuclides are in topological order, with the decay constants on the diagonal, so
+    its eigenvectors are the classic Bateman coefficients and are computed once. Populations for any array of times
+    are then N(t) = V exp(λ t) V^-1 N(0), a single matrix product per batch of time points. The last column is
+    the OUTSIDE sink of DecayChain, so every row adds up to initial_atoms.
+
+    half_lives and branching are passed on to DecayChain.
+    Raises ValueError if two nuclides on one chain share the same decay constant (degenerate Bateman system).
+    """
+    def __init__(self, root, half_lives=None, branching=None, initial_atoms=1.0):
+        self.chain = DecayChain(root, half_lives, branching)
+        self.labels = self.chain.labels
+        self.decay_constants = self.chain.decay_constants
+        n = len(self.chain)
+
+        matrix = np.diag(-self.decay_constants) + self.chain.fractions * self.decay_constants
+        self.matrix = matrix
+
+        # eigenvectors of the lower triangular matrix by forward substitution, then the coefficients of N(0)
+        self.eigenvectors = np.zeros((n, n))
+        for k in range(n):
+            self.eigenvectors[k, k] = 1.0
+            for i in range(k + 1, n):
+                numerator = matrix[i, k:i] @ self.eigenvectors[k:i, k]
+                if numerator == 0.0:
+                    continue
+                gap = self.decay_constants[i] - self.decay_constants[k]
+                if gap == 0.0:
+                    raise ValueError(f"{self.labels[i]} and {self.labels[k]} have the same decay constant")
+                self.eigenvectors[i, k] = numerator / gap
+        initial = np.zeros(n)
+        initial[0] = initial_atoms
+        self.coefficients = np.linalg.solve(self.eigenvectors, initial)
+
+    def populations(self, times):
+        """
+        Returns an array of shape (len(times), number of nuclides) with the number of atoms of each nuclide
+        (columns in the order of self.labels) at every time, in seconds. Rounding in the sum of exponentials can
+        leave a nuclide that has decayed away slightly below zero; such values are clipped to 0.
+        Time Complexity: O(t * n^2) for t time points and n nuclides
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        exponentials = np.exp(-np.outer(times, self.decay_constants))        # (t, n)
+        populations = (exponentials * self.coefficients) @ self.eigenvectors.T
+        return np.maximum(populations, 0.0, out=populations)
+
+    def activities(self, times):
+        """
+        Returns the activity λN (decays per second) of every nuclide, same shape as populations().
+        """
+        return self.populations(times) * self.decay_constants
+
+    def write_csv(self, filepath, times, chunk_size=10000):
+        """
+        Streams populations and activities for a long time grid to CSV, evaluating chunk_size time points at a
+        time so memory does not grow with the length of the grid.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        with open(filepath, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time_s"] + [f"N({label})" for label in self.labels] +
+                            [f"A({label})" for label in self.labels])
+            for start in range(0, len(times), chunk_size):
+                chunk = times[start:start + chunk_size]
+                populations = self.populations(chunk)
+                activities = populations * self.decay_constants
+                writer.writerows(np.column_stack((chunk, populations, activities)).tolist())
@@ -0,0 +1,40 @@
+"""
+Cold-start benchmark: how long a fresh interpreter takes to import the decay tree core.
+
+"before" imports what the old main_2.py pulled in unconditionally (graphviz and fpdf next to the core classes);
+"after" imports decay_tree alone, which is all a worker or service needs until it renders something.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_cold_start
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 7
+CASES = [
+    ("before: graphviz + fpdf + core", "import graphviz, fpdf, decay_tree"),
+    ("after:  decay_tree only", "import decay_tree"),
+    ("after:  decay_tree + first lookup", "import decay_tree; decay_tree.check_element_exists('U', 92, 238)"),
+]
+
+
+def cold_start(statement):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    baseline = cold_start("pass")
+    print(f"interpreter startup {baseline * 1000:7.1f} ms")
+    for name, statement in CASES:
+        print(f"{name:35s} {(cold_start(statement) - baseline) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
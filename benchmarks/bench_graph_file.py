@@ -0,0 +1,53 @@
+"""
+Binary decay graph benchmark: building the decay DAG of every known nuclide from Hg to Lr, against loading the
+same network from a file written by decay_graph.save_graph, then searching the optimal path of every root.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_graph_file
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+from decay_graph import load_graph, save_graph
+from decay_tree import Tree
+from nuclide_index import get_index
+
+
+def build(roots):
+    tree = Tree()
+    return tree, [tree.build_tree(symbol, z, a, dag=True) for symbol, z, a in roots]
+
+
+def main():
+    roots = [(symbol, z, a) for (z, a), (symbol, _) in sorted(get_index().nuclides.items()) if 80 <= z <= 103]
+    filepath = os.path.join(tempfile.gettempdir(), "heavy_region.dcyg")
+
+    start = time.perf_counter()
+    tree, nodes = build(roots)
+    build_time = time.perf_counter() - start
+    size = save_graph(nodes, filepath)
+
+    start = time.perf_counter()
+    graph = load_graph(filepath)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree_paths = [[(node.value.atomic_number.value, node.value.mass_number.value)
+                   for node in tree.find_optimal_path(root)] for root in nodes]
+    tree_path_time = time.perf_counter() - start
+    start = time.perf_counter()
+    graph_paths = [[(int(graph.z[node]), int(graph.a[node])) for node in graph.find_optimal_path(int(root))]
+                   for root in graph.roots]
+    graph_path_time = time.perf_counter() - start
+    assert tree_paths == graph_paths
+
+    print(f"network    {size[0]} nodes, {size[1]} edges, {len(roots)} roots, {os.path.getsize(filepath)} bytes")
+    print(f"obtain     build {build_time * 1000:8.1f} ms | load {load_time * 1000:8.3f} ms")
+    print(f"all paths  Tree {tree_path_time * 1000:8.1f} ms | DecayGraph {graph_path_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
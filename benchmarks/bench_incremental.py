@@ -0,0 +1,47 @@
+"""
+Incremental network benchmark: a sequence of queries (several roots, then a wider Z window) answered by fresh
+DAG builds every time, against one DecayNetwork that only expands what each query adds.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_incremental
+"""
+import sys
+import time
+
+sys.path.insert(0, ".")
+from decay_network import DecayNetwork
+from decay_tree import Tree
+
+QUERIES = [("U", 92, 238, 80), ("U", 92, 235, 80), ("Pu", 94, 244, 80), ("Cf", 98, 252, 80), ("Lr", 103, 251, 80),
+           ("U", 92, 238, 70), ("Lr", 103, 251, 70), ("No", 102, 255, 60)]
+
+
+def fresh(queries):
+    created = 0
+    for symbol, z, a, z_min in queries:
+        tree = Tree(z_min=z_min)
+        tree.find_optimal_path(tree.build_tree(symbol, z, a, dag=True))
+        created += tree.node_counter
+    return created
+
+
+def incremental(queries):
+    network = DecayNetwork()
+    for symbol, z, a, z_min in queries:
+        if z_min < network.tree.z_min:
+            network.widen(z_min=z_min)
+        network.add_root(symbol, z, a)
+        network.find_optimal_path(z, a)
+    return network.tree.node_counter
+
+
+def main():
+    for name, function in (("fresh builds", fresh), ("DecayNetwork", incremental)):
+        start = time.perf_counter()
+        created = function(QUERIES)
+        print(f"{name:13s} {len(QUERIES)} queries | {created:6d} nodes created | "
+              f"{(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark of the explicit-stack Tree.build_tree / get_path against the recursive versions they replaced.
+
+Both builders must produce the same tree (compared through levelorder, node ids and the optimal path). Time is
+the best of several runs; memory is the tracemalloc peak of one build.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_iterative
+"""
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+from decay_tree import Tree, TreeNode
+
+ROOTS = [("U", 92, 238), ("Cf", 98, 252), ("No", 102, 255), ("Lr", 103, 251)]
+REPEAT = 3
+
+
+class RecursiveTree(Tree):
+    """
+    The recursive build_tree and get_path as they were before the explicit-stack rewrite.
+    """
+    def build_tree(self, element, atomic_number, mass_number, depth=0, dag=False):
+        if atomic_number < 80 or mass_number <= 0 or atomic_number > 103:
+            return None
+        if dag and (atomic_number, mass_number) in self.nodes:
+            return self.nodes[(atomic_number, mass_number)]
+
+        self.node_counter += 1
+        new_node = TreeNode(element, atomic_number, mass_number, self.node_counter)
+        if dag:
+            self.nodes[(atomic_number, mass_number)] = new_node
+        depth += 1
+        self.max_depth = max(self.max_depth, depth)
+
+        for decay, branch in ((self.alpha_decay, 'left'), (self.beta_plus, 'right'), (self.beta_minus, 'middle')):
+            new_a_num, new_mass_num = decay(atomic_number, mass_number)
+            l = self.find_element(new_a_num, new_mass_num)
+            if l is not None:
+                if self.compare_calculate_mass_defect(new_node.value[0], new_node.value[1], new_node.value[2], l, new_a_num, new_mass_num):
+                    setattr(new_node, branch, self.build_tree(l, new_a_num, new_mass_num, depth, dag))
+        return new_node
+
+    def get_path(self, root):
+        if root:
+            self.optimal_path_nodes.append(root)
+            dif1 = dif2 = dif3 = 0
+            if root.left is not None:
+                dif1 = root.left.value.binding_energy.value - root.value.binding_energy.value
+            if root.middle is not None:
+                dif2 = root.middle.value.binding_energy.value - root.value.binding_energy.value
+            if root.right is not None:
+                dif3 = root.right.value.binding_energy.value - root.value.binding_energy.value
+            m = max(dif1, dif2, dif3)
+            if m == dif1:
+                self.optimal_path_edges.append((root, root.left, 'α'))
+                root = root.left
+            elif m == dif2:
+                self.optimal_path_edges.append((root, root.middle, 'β-'))
+                root = root.middle
+            else:
+                self.optimal_path_edges.append((root, root.right, 'β+'))
+                root = root.right
+            if root is not None:
+                self.e.addnode(root.value.symbol.prop, root.value.atomic_number.value, root.value.mass_number.value)
+                self.get_path(root)
+
+
+def run(tree_class, root):
+    tree = tree_class()
+    tree.root = tree.build_tree(*root)
+    tree.get_path(tree.root)
+    return tree
+
+
+def summary(tree):
+    return [str(v) for v in tree.levelorder(tree.root)], tree.node_counter, tree.max_depth, str(tree.e)
+
+
+def best_time(tree_class, root):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        run(tree_class, root)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(tree_class, root):
+    tracemalloc.start()
+    run(tree_class, root)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    run(Tree, ROOTS[0])                                  # warm the nuclide index and binding energy cache
+    for root in ROOTS:
+        assert summary(run(Tree, root)) == summary(run(RecursiveTree, root)), root
+        name = f"{root[0]}-{root[2]}"
+        rec_time, it_time = best_time(RecursiveTree, root), best_time(Tree, root)
+        rec_mem, it_mem = peak_memory(RecursiveTree, root), peak_memory(Tree, root)
+        print(f"{name:7s} nodes {run(Tree, root).node_counter:6d} | recursive {rec_time * 1000:8.1f} ms"
+              f" {rec_mem / 1024:8.0f} KiB | iterative {it_time * 1000:8.1f} ms {it_mem / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
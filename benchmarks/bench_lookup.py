@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for nuclide lookups: the old string-prefix isotope scan against the shared (Z, A) index.
+
+The lookups timed are exactly the find_element calls that Tree.build_tree makes while building the U-238 and
+Pu-244 trees (three per node). The call sequence is replayed from the index so both versions answer the same
+queries.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_lookup
+"""
+import sys
+import timeit
+
+import periodictable
+
+sys.path.insert(0, ".")
+from nuclide_index import get_index
+
+ROOTS = [("U", 92, 238), ("Pu", 94, 244)]
+REPEAT = 5
+
+
+def legacy_find_element(atomic_number, mass_number):
+    # the lookup every builder used before the index existed
+    element = periodictable.elements[atomic_number]
+    for i in element:
+        if str(i)[:3] == str(mass_number):
+            return i.symbol
+    return None
+
+
+def bepn(index, atomic_number, mass_number):
+    total_mass_atom = (atomic_number * 1.007276) + ((mass_number - atomic_number) * 1.008665)
+    return (total_mass_atom - index.atomic_mass(atomic_number, mass_number)) * 931.5 / mass_number
+
+
+def lookup_trace(atomic_number, mass_number):
+    """
+    Returns the (Z, A) queries Tree.build_tree sends to find_element for the given root, in call order.
+    """
+    index = get_index()
+    trace = []
+    stack = [(atomic_number, mass_number)]
+    while stack:
+        z, a = stack.pop()
+        if z < 80 or a <= 0 or z > 103:
+            continue
+        children = []
+        for new_z, new_a in ((z - 2, a - 4), (z - 1, a), (z + 1, a)):    # alpha, beta plus, beta minus
+            trace.append((new_z, new_a))
+            if index.find_element(new_z, new_a) is not None and bepn(index, z, a) < bepn(index, new_z, new_a):
+                children.append((new_z, new_a))
+        stack.extend(reversed(children))
+    return trace
+
+
+def main():
+    index = get_index()
+    for symbol, z, a in ROOTS:
+        trace = lookup_trace(z, a)
+        assert [legacy_find_element(*q) for q in trace] == [index.find_element(*q) for q in trace]
+
+        legacy = min(timeit.repeat(lambda: [legacy_find_element(*q) for q in trace], number=100, repeat=REPEAT))
+        indexed = min(timeit.repeat(lambda: [index.find_element(*q) for q in trace], number=100, repeat=REPEAT))
+        per_call = 1e9 / (100 * len(trace))
+        print(f"{symbol}-{a}: {len(trace)} lookups | string scan {legacy * per_call:8.1f} ns/lookup"
+              f" | index {indexed * per_call:6.1f} ns/lookup | speedup {legacy / indexed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Memory benchmark for the per-node records: tracemalloc peak of building a large tree with the compact __slots__
+Element/TreeNode (property nodes shared per nuclide) against the original dict-backed four-node linked list.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_memory
+"""
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+import decay_tree
+from decay_tree import Tree
+
+ROOTS = [("No", 102, 255), ("Lr", 103, 251)]
+
+
+class LinkedElement:
+    """
+    The Element record as it was before: a singly linked list of four dict-backed nodes.
+    """
+    class Node():
+        def __init__(self, prop, value):
+            self.prop = prop
+            self.value = value
+            self.next = None
+
+    def __init__(self, element, atomic_no, mass_no):
+        self.symbol = self.head = self.Node("Symbol", element)
+        self.atomic_number = self.head.next = self.Node("Atomic Number", atomic_no)
+        self.mass_number = self.head.next.next = self.Node("Mass Number", mass_no)
+        self.binding_energy = self.head.next.next.next = self.tail = self.Node("Binding Energy", decay_tree.get_service().per_nucleon(atomic_no, mass_no))
+        self.size = 4
+
+    def __getitem__(self, key):
+        if not str(key).isnumeric():
+            print("Error: Not a number")
+            return
+        if 0 > key or key >= self.size:
+            print("Error: Index out of bounds")
+            return
+        node = self.head
+        for _ in range(key):
+            node = node.next
+        return node.value
+
+
+class DictTreeNode:
+    def __init__(self, element, atomic_number, mass_number, node_id):
+        self.value = LinkedElement(element, atomic_number, mass_number)
+        self.node_id = node_id
+        self.children = [None, None, None]      # the left / middle / right slots of the original node
+
+    def child(self, mode):
+        children = self.children
+        return children[mode] if mode < len(children) else None
+
+    def set_child(self, mode, child):
+        children = self.children
+        if len(children) <= mode:
+            children.extend([None] * (mode + 1 - len(children)))
+        children[mode] = child
+
+
+def measure(root):
+    tree = Tree()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree.root = tree.build_tree(*root)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return tree.node_counter, peak, elapsed
+
+
+def main():
+    measure(ROOTS[0])                                    # warm the nuclide index and binding energy cache
+    for root in ROOTS:
+        nodes, compact_peak, compact_time = measure(root)
+        decay_tree.TreeNode, original = DictTreeNode, decay_tree.TreeNode
+        try:
+            _, linked_peak, linked_time = measure(root)
+        finally:
+            decay_tree.TreeNode = original
+        print(f"{root[0]}-{root[2]} {nodes} nodes | linked list {linked_peak / nodes:6.0f} B/node {linked_time * 1000:6.0f} ms"
+              f" | slots {compact_peak / nodes:6.0f} B/node {compact_time * 1000:6.0f} ms"
+              f" | {linked_peak / compact_peak:4.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Parallel build benchmark on the largest tree-mode builds of the corpus: build_tree against build_tree_parallel.
+
+For every root and split depth it reports the share of the parallel build left in the calling process (top of the
+tree and assembly of the DecayGraph, measured by running the worker tasks in this process) and the share of the
+largest subtree; together they bound the speedup. Then it times build_tree_parallel on warm pools of 1, 2, 4 and 8
+workers, as far as there are CPUs, and checks each graph has the node count of the serial tree.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_parallel
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, ".")
+from decay_tree import Tree
+from parallel_build import build_tree_parallel, warm_worker
+
+ROOTS = [("Fm", 100, 257), ("No", 102, 255), ("Lr", 103, 251)]
+SPLIT_DEPTHS = (2, 4, 6, 8)
+REPEATS = 3
+
+
+class InProcess:
+    """
+    Runs the tasks of build_tree_parallel in this process, timing the worker side and each subtree.
+    """
+    def __init__(self):
+        self.worker_time = 0.0
+        self.task_times = []
+
+    def map(self, function, tasks, chunksize=1):
+        results = []
+        for task in tasks:
+            start = time.perf_counter()
+            results.append(function(task))
+            self.task_times.append(time.perf_counter() - start)
+        self.worker_time += sum(self.task_times)
+        return results
+
+
+def best(build):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = build()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    print(f"{cpus} CPUs")
+    for symbol, z, a in ROOTS:
+        def serial():
+            tree = Tree()
+            tree.build_tree(symbol, z, a)
+            return tree
+        serial_ms, reference = best(serial)
+        print(f"{symbol}-{a}: {reference.node_counter} nodes | build_tree {serial_ms:8.1f} ms")
+
+        for split_depth in SPLIT_DEPTHS:
+            pool = InProcess()
+            start = time.perf_counter()
+            build_tree_parallel(Tree(), symbol, z, a, split_depth=split_depth, pool=pool)
+            total = time.perf_counter() - start
+            print(f"    split depth {split_depth}: {len(pool.task_times):4d} subtrees | calling process "
+                  f"{(total - pool.worker_time) / total:6.1%} | largest subtree {max(pool.task_times) / total:6.1%}")
+
+        for workers in (1, 2, 4, 8):
+            if workers > cpus and workers > 1:
+                break
+            with ProcessPoolExecutor(workers, initializer=warm_worker) as pool:
+                for split_depth in SPLIT_DEPTHS:
+                    def parallel():
+                        return build_tree_parallel(Tree(), symbol, z, a, split_depth=split_depth, pool=pool)
+                    parallel()                                  # warm the pool's workers
+                    parallel_ms, graph = best(parallel)
+                    assert len(graph) == reference.node_counter
+                    print(f"    {workers} workers, split depth {split_depth} | {parallel_ms:8.1f} ms "
+                          f"({serial_ms / parallel_ms:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
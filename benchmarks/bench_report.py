@@ -0,0 +1,47 @@
+"""
+PDF report benchmark over the optimal paths of every known nuclide from Hg to Lr: the same ReportWriter tables
+written as one document per chain, as files of 100 chains and as a single report, with Tree.generate_pdf's plain
+one-line-per-nuclide documents for reference. Trees are built before timing.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_report
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+from decay_tree import Tree
+from nuclide_index import get_index
+from report import ReportWriter
+from transition_table import TransitionTable
+
+
+def main():
+    transitions = TransitionTable()
+    chains = []
+    for (z, a), (symbol, _) in sorted(get_index().nuclides.items()):
+        if 80 <= z <= 103:
+            tree = Tree(transitions=transitions)
+            root = tree.build_tree(symbol, z, a, dag=True)
+            chains.append((tree, root, tree.find_optimal_path(root)))
+    directory = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    for position, (tree, _, _) in enumerate(chains):
+        tree.generate_pdf(os.path.join(directory, f"path_{position}.pdf"))
+    print(f"{len(chains)} chains | generate_pdf, one plain document per chain "
+          f"{(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    for name, chains_per_file in (("one document per chain", 1), ("100 chains per file", 100),
+                                  ("single report", None)):
+        start = time.perf_counter()
+        with ReportWriter(os.path.join(directory, "report.pdf"), chains_per_file) as writer:
+            for chain in chains:
+                writer.add_chain(*chain)
+        print(f"{len(chains)} chains | ReportWriter, {name:22s} {(time.perf_counter() - start) * 1000:8.1f} ms "
+              f"({len(writer.files)} files)")
+
+if __name__ == "__main__":
+    main()
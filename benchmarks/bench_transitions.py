@@ -0,0 +1,67 @@
+"""
+Benchmark of the vectorized TransitionTable against deriving decays one node at a time.
+
+Two measurements over the whole Z 80-103 region:
+    edges      - every allowed alpha / beta minus / beta plus edge, scalar loop vs one TransitionTable
+    full chart - a DAG built from every nuclide in the region, with and without the table
+
+Usage (from the repository root):
+    python -m benchmarks.bench_transitions
+"""
+import sys
+import time
+
+sys.path.insert(0, ".")
+from binding_energy import get_service
+from decay_modes import DEFAULT_MODES
+from decay_tree import Tree
+from nuclide_index import get_index
+from transition_table import TransitionTable
+
+
+def scalar_edges(tree, roots):
+    edges = []
+    for symbol, z, a in roots:
+        for mode, decay in enumerate(DEFAULT_MODES):
+            cz, ca = decay.daughter(z, a)
+            l = tree.find_element(cz, ca)
+            if l is not None and 80 <= cz <= 103 and ca > 0:
+                if tree.compare_calculate_mass_defect(symbol, z, a, l, cz, ca):
+                    edges.append((z, a, cz, ca, decay.label))
+    return edges
+
+
+def full_chart(roots, transitions=None):
+    tree = Tree(transitions=transitions)
+    for symbol, z, a in roots:
+        tree.build_tree(symbol, z, a, dag=True)          # the shared transposition table spans all roots
+    return tree.node_counter
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    index = get_index()
+    roots = [(symbol, z, a) for (z, a), (symbol, _) in sorted(index.nuclides.items()) if 80 <= z <= 103]
+
+    get_service().clear()
+    edges, scalar_time = timed(scalar_edges, Tree(), roots)
+    table, table_time = timed(TransitionTable)
+    assert edges == table.edges()
+    print(f"edges      {len(edges)} for {len(roots)} nuclides | scalar {scalar_time * 1000:7.1f} ms"
+          f" | vectorized {table_time * 1000:7.1f} ms")
+
+    get_service().clear()
+    nodes, scalar_time = timed(full_chart, roots)
+    table_nodes, table_time = timed(full_chart, roots, table)
+    assert nodes == table_nodes
+    print(f"full chart {nodes} nodes | per-node lookups {scalar_time * 1000:7.1f} ms"
+          f" | transition table {table_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
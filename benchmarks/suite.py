@@ -0,0 +1,268 @@
+"""
+Benchmark suite for the decay tree: lookup, binding energy, build, traversal, path search and rendering, over a fixed
+corpus of one heavy root per element from Hg (Z=80) to Lr (Z=103).
+
+For every (root, stage) it records the best wall time of several repeats, the tracemalloc peak of one extra run and
+the number of tree nodes involved, and writes them as JSON. Two result files can then be compared; any stage that
+got slower (or used more memory) by more than the threshold is flagged and the exit status is 1.
+
+Usage (from the repository root):
+    python -m benchmarks.suite run [--out results.json] [--repeat 3] [--roots U-238,Lr-251] [--stages build_tree,...]
+    python -m benchmarks.suite compare before.json after.json [--threshold 0.10]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+from binding_energy import get_service
+from decay_tree import Tree
+
+CORPUS = [
+    ("Hg", 80, 206), ("Tl", 81, 210), ("Pb", 82, 212), ("Bi", 83, 215), ("Po", 84, 218), ("At", 85, 219),
+    ("Rn", 86, 222), ("Fr", 87, 223), ("Ra", 88, 228), ("Ac", 89, 227), ("Th", 90, 234), ("Pa", 91, 233),
+    ("U", 92, 238), ("Np", 93, 237), ("Pu", 94, 244), ("Am", 95, 243), ("Cm", 96, 248), ("Bk", 97, 249),
+    ("Cf", 98, 252), ("Es", 99, 254), ("Fm", 100, 257), ("Md", 101, 258), ("No", 102, 255), ("Lr", 103, 251),
+]
+
+# differences below these are timer / allocator noise and never count as regressions
+NOISE_SECONDS = 0.0005
+NOISE_BYTES = 4096
+
+
+def _built(symbol, atomic_number, mass_number):
+    tree = Tree()
+    tree.root = tree.build_tree(symbol, atomic_number, mass_number)
+    return tree
+
+
+def _tree_nodes(tree):
+    return [node for _, node in tree.iter_levelorder(tree.root)]
+
+
+# Each stage does its setup for one root and returns (run, nodes): run() is the timed work, nodes the tree size.
+
+def stage_find_element(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    keys = [(node.value.atomic_number.value, node.value.mass_number.value) for node in _tree_nodes(tree)]
+
+    def run():
+        for z, a in keys:
+            tree.find_element(z, a)
+    return run, len(keys)
+
+
+def stage_calculate_binding_energy(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    elements = [node.value for node in _tree_nodes(tree)]
+
+    def run():
+        get_service().clear()                  # include the cold computations, not only cache hits
+        for element in elements:
+            element.calculate_binding_energy(element.symbol.value, element.atomic_number.value,
+                                             element.mass_number.value)
+    return run, len(elements)
+
+
+def stage_compare_calculate_mass_defect(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    pairs = []
+    for node in _tree_nodes(tree):
+        for child in node.children:
+            if child is not None:
+                pairs.append((node.value.symbol.value, node.value.atomic_number.value, node.value.mass_number.value,
+                              child.value.symbol.value, child.value.atomic_number.value, child.value.mass_number.value))
+
+    def run():
+        for pair in pairs:
+            tree.compare_calculate_mass_defect(*pair)
+    return run, len(pairs) + 1
+
+
+def stage_decay_allowed(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    keys = [(node.value.atomic_number.value, node.value.mass_number.value, mode)
+            for node in _tree_nodes(tree) for mode in range(len(tree.modes))]
+
+    def run():
+        for key in keys:
+            tree.decay_allowed(*key)
+    return run, len(keys)
+
+
+def stage_build_tree(symbol, atomic_number, mass_number):
+    nodes = _built(symbol, atomic_number, mass_number).node_counter
+
+    def run():
+        _built(symbol, atomic_number, mass_number)
+    return run, nodes
+
+
+def stage_levelorder(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    return (lambda: tree.levelorder(tree.root)), tree.node_counter
+
+
+def stage_get_path(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+
+    def run():
+        tree.reset_path()
+        tree.get_path(tree.root)
+    return run, tree.node_counter
+
+
+def stage_visualize_tree(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    tree.get_path(tree.root)
+    return (lambda: tree.visualize_tree(tree.root).source), tree.node_counter
+
+
+def stage_generate_pdf(symbol, atomic_number, mass_number):
+    tree = _built(symbol, atomic_number, mass_number)
+    tree.get_path(tree.root)
+    filepath = os.path.join(tempfile.gettempdir(), f"bench_{symbol}{mass_number}.pdf")
+    return (lambda: tree.generate_pdf(filepath)), len(tree.e)
+
+
+STAGES = {
+    "find_element": stage_find_element,
+    "calculate_binding_energy": stage_calculate_binding_energy,
+    "compare_calculate_mass_defect": stage_compare_calculate_mass_defect,
+    "decay_allowed": stage_decay_allowed,
+    "build_tree": stage_build_tree,
+    "levelorder": stage_levelorder,
+    "get_path": stage_get_path,
+    "visualize_tree": stage_visualize_tree,
+    "generate_pdf": stage_generate_pdf,
+}
+
+
+def measure(stage, root, repeat):
+    """
+    Returns the result record of one stage on one root, or a record with "skipped" when an optional
+    dependency of the stage (graphviz, fpdf) is not installed.
+    """
+    symbol, atomic_number, mass_number = root
+    record = {"root": f"{symbol}-{mass_number}", "stage": stage}
+    try:
+        run, nodes = STAGES[stage](symbol, atomic_number, mass_number)
+        run()                                  # warm up imports and caches
+    except ImportError as error:
+        record["skipped"] = str(error)
+        return record
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record.update(seconds=min(times), peak_bytes=peak, nodes=nodes)
+    return record
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(roots=CORPUS, stages=tuple(STAGES), repeat=3):
+    results = []
+    for root in roots:
+        for stage in stages:
+            record = measure(stage, root, repeat)
+            results.append(record)
+            if "skipped" in record:
+                print(f"{record['root']:7s} {stage:30s} skipped ({record['skipped']})")
+            else:
+                print(f"{record['root']:7s} {stage:30s} {record['seconds'] * 1000:10.3f} ms "
+                      f"{record['peak_bytes'] / 1024:10.1f} KiB {record['nodes']:8d} nodes")
+    return {"meta": {"python": platform.python_version(), "platform": platform.platform(), "commit": _commit(),
+                     "date": datetime.datetime.now().isoformat(timespec="seconds"), "repeat": repeat},
+            "results": results}
+
+
+def compare(before, after, threshold=0.10):
+    """
+    Compares two result dicts and returns the list of regression messages. A stage regresses when its time or
+    peak memory grew by more than threshold (a fraction), ignoring differences below NOISE_SECONDS / NOISE_BYTES.
+    """
+    old = {(r["root"], r["stage"]): r for r in before["results"] if "skipped" not in r}
+    regressions = []
+    for record in after["results"]:
+        key = (record["root"], record["stage"])
+        if "skipped" in record or key not in old:
+            continue
+        base = old[key]
+        time_ratio = record["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        memory_ratio = record["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else 1.0
+        flags = []
+        if time_ratio > 1 + threshold and record["seconds"] - base["seconds"] > NOISE_SECONDS:
+            flags.append("time")
+        if memory_ratio > 1 + threshold and record["peak_bytes"] - base["peak_bytes"] > NOISE_BYTES:
+            flags.append("memory")
+        line = (f"{key[0]:7s} {key[1]:30s} time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}"
+                f"  nodes {base['nodes']} -> {record['nodes']}")
+        if flags:
+            line += "  REGRESSION (" + ", ".join(flags) + ")"
+            regressions.append(line)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decay tree benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the suite and write a results file")
+    run_parser.add_argument("--out", default="benchmark_results.json")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--roots", help="comma separated subset of the corpus, eg. U-238,Lr-251")
+    run_parser.add_argument("--stages", help="comma separated subset of: " + ", ".join(STAGES))
+    compare_parser = commands.add_parser("compare", help="compare two results files and flag regressions")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, eg. 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        roots = CORPUS
+        if args.roots:
+            wanted = set(args.roots.split(","))
+            roots = [root for root in CORPUS if f"{root[0]}-{root[2]}" in wanted]
+        stages = args.stages.split(",") if args.stages else tuple(STAGES)
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            parser.error("unknown stage(s): " + ", ".join(unknown))
+        results = run_suite(roots, stages, args.repeat)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"results written to {args.out}")
+        return 0
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    regressions = compare(before, after, args.threshold)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+from nuclide_index import get_index
+
+PROTON_MASS = 1.007276      # amu
+NEUTRON_MASS = 1.008665     # amu
+AMU_TO_MEV = 931.5          # energy equivalent of 1 amu in MeV
+ELECTRON_MASS = 0.000548580 # amu
+
+
+class BindingEnergyService:
+    """
+    Single provider of the mass defect / binding energy arithmetic used by Element, ElementList and Tree.
+    Results are kept in a bounded LRU cache keyed by (Z, A), so building a tree computes each nuclide once
+    instead of once per parent-child comparison.
+
+    Known isotopes are read from the binding energies precomputed in the shared nuclide index; any other isotope
+    is computed here with a mass of 0, which is what the original per-class calculations did.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()                 # (Z, A) -> (total BE, BE per nucleon)
+
+    def binding_energy(self, atomic_number, mass_number):
+        """
+        Returns (total binding energy, binding energy per nucleon) in MeV for the nuclide (Z, A).
+        Time Complexity: O(1) - cache hit or a single index lookup
+        """
+        key = (atomic_number, mass_number)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        result = get_index().energies.get(key)               # precomputed in the nuclide data file
+        if result is None or mass_number <= 0:
+            protons = atomic_number
+            neutrons = mass_number - atomic_number
+            total_mass_atom = (protons * PROTON_MASS) + (neutrons * NEUTRON_MASS)
+            mass_defect = total_mass_atom - get_index().atomic_mass(atomic_number, mass_number)
+            be = mass_defect * AMU_TO_MEV                    # e = mc**2
+            result = (be, be / mass_number)
+
+        self._cache[key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)                   # evict the least recently used nuclide
+        return result
+
+    def total(self, atomic_number, mass_number):
+        return self.binding_energy(atomic_number, mass_number)[0]
+
+    def per_nucleon(self, atomic_number, mass_number):
+        return self.binding_energy(atomic_number, mass_number)[1]
+
+    def stats(self):
+        """
+        Returns the cache counters as a dict, eg. {'hits': 30, 'misses': 15, 'size': 15, 'maxsize': 4096}
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.maxsize}
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+_service = None
+
+def get_service():
+    """
+    Returns the shared BindingEnergyService, creating it on first use.
+    """
+    global _service
+    if _service is None:
+        _service = BindingEnergyService()
+    return _service
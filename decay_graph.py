@@ -0,0 +1,327 @@
+"""
+Compact binary storage of built decay networks.
+
+save_graph walks a tree or DAG built by Tree.build_tree (or NuclearGraph.build_decay_tree) once and writes it as
+flat arrays:
+    z, a         int16 per node          atomic and mass number
+    bepn         float64 per node        binding energy per nucleon in MeV
+    node_id      int32 per node          the TreeNode.node_id, so DOT node names stay the same
+    offsets      int64, nodes + 1        CSR row pointers: the edges of node i are offsets[i]:offsets[i + 1]
+    targets      int32 per edge          daughter node index
+    modes        uint8 per edge          index of the decay mode in the tree's DecayModeRegistry
+    q            float64 per edge        Q value of the decay in MeV, from q_values.QValueTable
+    roots        int32 per root
+    labels       UTF-32, fixed width     label of every decay mode, so a file can be drawn without its registry;
+                                         the width is that of the longest label, stored in the header
+A node shared in a DAG is stored once. Each node's edges are in registry order, the order Tree walks its children
+in.
+
+load_graph memory-maps the file read-only and returns a DecayGraph whose arrays are views into the mapping, so a
+network of any size loads in constant time and nothing is read until it is used. DecayGraph has the traversal,
+optimal path and DOT export of Tree, working on node indices instead of TreeNode objects.
+"""
+import struct
+from collections import deque
+
+import numpy as np
+
+from binding_energy import get_service
+from decay_modes import DEFAULT_MODES
+from decay_tree import digraph_items, write_dot_items
+from nuclide_index import get_index
+from q_values import get_table
+
+MAGIC = b"DCYG"
+VERSION = 4
+HEADER = struct.Struct("<4sIQQQQQ")      # magic, version, nodes, edges, roots, decay modes, label width
+SECTIONS = (("z", "<i2", "nodes"), ("a", "<i2", "nodes"), ("bepn", "<f8", "nodes"), ("node_id", "<i4", "nodes"),
+            ("offsets", "<i8", "offsets"), ("targets", "<i4", "edges"), ("modes", "u1", "edges"),
+            ("q", "<f8", "edges"), ("roots", "<i4", "roots"), ("labels", "<U{}", "labels"))
+ALIGNMENT = 8
+
+
+def _layout(nodes, edges, roots, labels, label_width):
+    # byte offset and length of every section, each aligned to 8 bytes after the header
+    counts = {"nodes": nodes, "offsets": nodes + 1, "edges": edges, "roots": roots, "labels": labels}
+    position = HEADER.size
+    layout = []
+    for name, dtype, count in SECTIONS:
+        dtype = np.dtype(dtype.format(label_width))
+        position += -position % ALIGNMENT
+        layout.append((name, dtype, position, counts[count]))
+        position += dtype.itemsize * counts[count]
+    return layout
+
+
+def _tree_children(node, modes):
+    # (child, mode) in registry order
+    return [(child, mode) for mode, child in enumerate(node.children) if child is not None]
+
+
+def _graph_children(node, modes):
+    # GraphNode: the decay mode is recovered from the title NuclearGraph puts in front of the symbol
+    titles = {mode.title: position for position, mode in enumerate(modes)}
+    return [(child, titles[str(child.value[0]).rsplit(" ", 1)[0]]) for child in node.decay_products]
+
+
+def _node_record(node):
+    if hasattr(node, "decay_products"):
+        _, atomic_number, mass_number = node.value
+        return atomic_number, mass_number, get_service().per_nucleon(atomic_number, mass_number), 0
+    value = node.value
+    return value.atomic_number.value, value.mass_number.value, value.binding_energy.value, node.node_id
+
+
+def save_graph(roots, filepath, modes=None):
+    """
+    Writes the decay network reachable from roots (one root node or a list of them) to filepath. modes is the
+    DecayModeRegistry the network was built with (default: the standard alpha / beta minus / beta plus).
+    Returns (nodes, edges) written.
+    Time Complexity: O(V + E)
+    """
+    if not isinstance(roots, (list, tuple)):
+        roots = [roots]
+    modes = DEFAULT_MODES if modes is None else modes
+    qvalues = get_table(modes)
+    index = {}                       # id(node) -> position, in breadth first discovery order
+    records, offsets, targets, edge_modes, edge_q = [], [0], [], [], []
+    pending = []                     # nodes whose edges still have to be written, in position order
+
+    def visit(node):
+        if id(node) not in index:
+            index[id(node)] = len(records)
+            records.append(_node_record(node))
+            pending.append(node)
+        return index[id(node)]
+
+    root_positions = [visit(root) for root in roots]
+    written = 0
+    while written < len(pending):    # edges of position i are written i-th, which keeps offsets in CSR order
+        node = pending[written]
+        children = _graph_children(node, modes) if hasattr(node, "decay_products") else _tree_children(node, modes)
+        atomic_number, mass_number = records[written][:2]
+        for child, mode in children:
+            targets.append(visit(child))
+            edge_modes.append(mode)
+            edge_q.append(qvalues.q_value(atomic_number, mass_number, mode))
+        offsets.append(len(targets))
+        written += 1
+
+    arrays = {"z": [r[0] for r in records], "a": [r[1] for r in records], "bepn": [r[2] for r in records],
+              "node_id": [r[3] for r in records], "offsets": offsets, "targets": targets, "modes": edge_modes, "q": edge_q,
+              "roots": root_positions, "labels": modes.labels}
+    label_width = max(1, max(map(len, modes.labels)))        # no label is truncated
+    with open(filepath, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records), len(targets), len(root_positions), len(modes),
+                            label_width))
+        for name, dtype, position, count in _layout(len(records), len(targets), len(root_positions), len(modes),
+                                                    label_width):
+            f.write(b"\0" * (position - f.tell()))
+            f.write(np.asarray(arrays[name], dtype=dtype).tobytes())
+    return len(records), len(targets)
+
+
+def load_graph(filepath):
+    """
+    Memory-maps a file written by save_graph and returns it as a DecayGraph. Raises ValueError if the file is
+    not a decay graph of this version.
+    Time Complexity: O(1) - only the header is read
+    """
+    mapping = np.memmap(filepath, dtype=np.uint8, mode="r")
+    if len(mapping) < HEADER.size:
+        raise ValueError(f"{filepath} is not a decay graph file")
+    magic, version = struct.unpack("<4sI", mapping[:8].tobytes())
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filepath} is not a version {VERSION} decay graph file")
+    _, _, nodes, edges, roots, labels, label_width = HEADER.unpack(mapping[:HEADER.size].tobytes())
+    arrays = {name: np.frombuffer(mapping, dtype=dtype, count=count, offset=position)
+              for name, dtype, position, count in _layout(nodes, edges, roots, labels, label_width)}
+    return DecayGraph(**arrays)
+
+
+class DecayGraph:
+    """
+    A decay network held as the flat arrays described at the top of this module (usually memory-mapped by
+    load_graph). Nodes are integer positions; self.root is the first root.
+
+    Mirrors the parts of Tree that only read the structure: iter_levelorder / iter_levels / levelorder,
+    find_optimal_path, visualize_tree and write_dot, producing the same levels, path and DOT text as the Tree
+    the file was saved from.
+    """
+    def __init__(self, z, a, bepn, node_id, offsets, targets, modes, q, roots, labels):
+        self.z = z
+        self.a = a
+        self.bepn = bepn
+        self.node_id = node_id
+        self.offsets = offsets
+        self.targets = targets
+        self.modes = modes
+        self.q = q
+        self.roots = roots
+        self.labels = labels.tolist()   # decay mode index -> label
+        self.root = int(roots[0]) if len(roots) else None
+        self.optimal_path = []          # node positions on the last path found
+        self.optimal_edges = set()      # (parent, child) positions on that path
+        self.q_labels = False           # also print each edge's Q value in the drawings
+
+    def __len__(self):
+        return len(self.z)
+
+    def children(self, node):
+        """
+        Returns [(child, mode), ...] of a node in registry order.
+        Time Complexity: O(1) per child
+        """
+        start, end = int(self.offsets[node]), int(self.offsets[node + 1])
+        return list(zip(self.targets[start:end].tolist(), self.modes[start:end].tolist()))
+
+    def symbol(self, node):
+        return get_index().symbol(int(self.z[node]))
+
+    def nuclide(self, node):
+        """
+        Returns (symbol, Z, A, binding energy per nucleon) of a node.
+        """
+        return self.symbol(node), int(self.z[node]), int(self.a[node]), float(self.bepn[node])
+
+    def iter_levelorder(self, root=None, max_depth=None, max_nodes=None):
+        """
+        Yields (depth, node) breadth first from root (default self.root), like Tree.iter_levelorder.
+        Shared nodes are yielded once.
+        Time complexity: O(V + E)
+        """
+        root = self.root if root is None else root
+        if root is None:
+            return
+        seen = np.zeros(len(self), dtype=bool)
+        seen[root] = True
+        queue = deque([(root, 1)])
+        count = 0
+        offsets, targets = self.offsets, self.targets
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth > max_depth:
+                return
+            yield depth, node
+            count += 1
+            if max_nodes is not None and count >= max_nodes:
+                return
+            for child in targets[offsets[node]:offsets[node + 1]].tolist():
+                if not seen[child]:
+                    seen[child] = True
+                    queue.append((child, depth + 1))
+
+    def iter_levels(self, root=None, max_depth=None, max_nodes=None):
+        """
+        Yields the nuclide tuples (see nuclide) of each level as a list.
+        """
+        level = []
+        current = 1
+        for depth, node in self.iter_levelorder(root, max_depth, max_nodes):
+            if depth != current:
+                yield level
+                level = []
+                current = depth
+            level.append(self.nuclide(node))
+        if level:
+            yield level
+
+    def levelorder(self, root=None):
+        q = []
+        for level in self.iter_levels(root):
+            q.extend(level)
+            q.append(None)
+        return q
+
+    def find_optimal_path(self, root=None, objective="final_be"):
+        """
+        Same dynamic programme and objectives as Tree.find_optimal_path ("final_be", "fewest_steps", "max_q"), with
+        ties going to the first child in registry order. Returns the list of node positions on the path and
+        remembers it for the DOT export.
+        Time Complexity: O(V + E)
+        """
+        root = self.root if root is None else root
+        if root is None:
+            return []
+        if objective not in ("final_be", "fewest_steps", "max_q"):
+            raise ValueError(f"Unknown objective: {objective}")
+
+        best = {}                    # position -> (score, next position); only nodes reachable from root
+        bepn, q = self.bepn, self.q
+        stack = [(root, None)]
+        while stack:                 # iterative post-order over positions
+            node, children = stack.pop()
+            if node in best:
+                continue
+            if children is None:     # first visit: keep the children in the frame for the second one
+                children = self.children(node)
+                stack.append((node, children))
+                stack.extend((child, None) for child, _ in children if child not in best)
+                continue
+
+            if not children:
+                best[node] = (float(bepn[node]) if objective == "final_be" else 0, None)
+                continue
+            choice = None
+            edge = int(self.offsets[node])
+            for child, _ in children:
+                value = best[child][0]
+                if objective == "fewest_steps":
+                    value -= 1
+                elif objective == "max_q":
+                    value += float(q[edge])
+                if choice is None or value > choice[0]:
+                    choice = (value, child)
+                edge += 1
+            best[node] = choice
+
+        path = [root]
+        while best[path[-1]][1] is not None:
+            path.append(best[path[-1]][1])
+        self.optimal_path = path
+        self.optimal_edges = set(zip(path, path[1:]))
+        return path
+
+    def _name(self, node):
+        return f"{self.symbol(node)}_{int(self.z[node])}_{int(self.a[node])}_{int(self.node_id[node])}"
+
+    def _drawing(self, root=None):
+        # same items, in the same pre-order, as Tree._drawing
+        root = self.root if root is None else root
+        if root is None:
+            return
+        on_path = set(self.optimal_path)
+        drawn = np.zeros(len(self), dtype=bool)
+        stack = [(root, None, None)]
+        while stack:
+            node, parent, relation = stack.pop()
+            name = self._name(node)
+            shared = drawn[node]
+            if not shared:
+                drawn[node] = True
+                label = (f"{self.symbol(node)}\nZ={int(self.z[node])}\nA={int(self.a[node])}"
+                         f"\nBE={float(self.bepn[node]):.2f} MeV")
+                yield "node", name, label, node in on_path
+            if parent is not None:
+                yield "edge", parent[1], name, relation, (parent[0], node) in self.optimal_edges
+            if shared:
+                continue
+            start, end = int(self.offsets[node]), int(self.offsets[node + 1])
+            for edge in reversed(range(start, end)):             # reversed so the first mode is drawn first
+                relation = self.labels[int(self.modes[edge])]
+                if self.q_labels:
+                    relation += f"\nQ={float(self.q[edge]):.2f} MeV"
+                stack.append((int(self.targets[edge]), (node, name), relation))
+
+    def write_dot(self, root, out):
+        """
+        Streams the network from root (None: the first root) as DOT text to a path or file-like object, with the
+        same arguments as Tree.write_dot. Returns the number of nodes written.
+        """
+        return write_dot_items(self._drawing(root), out)
+
+    def visualize_tree(self, root=None):
+        """
+        Returns a graphviz Digraph of the network, like Tree.visualize_tree.
+        """
+        return digraph_items(self._drawing(root))
@@ -0,0 +1,152 @@
+"""
+Registry of decay modes.
+
+A decay mode is a change (ΔZ, ΔA) of the parent nuclide plus a short label, a title for reports and an optional
+energetic filter. Tree, NuclearGraph, TransitionTable and the drawing code all loop over a DecayModeRegistry
+instead of naming alpha / beta plus / beta minus, and a TreeNode keeps its children in a list indexed by mode, so
+another mode costs one more slot and one more iteration per node and nothing else.
+
+The registry order is the order children are stored and walked (levels, paths, drawings). build_order is the order
+the builders try them in, which fixes node ids and, in a DAG, which route reaches a shared nuclide first. The
+default registry keeps the original three modes and both orders:
+    walk  alpha, beta minus, beta plus
+    build alpha, beta plus, beta minus
+
+    registry = DecayModeRegistry.with_modes("electron_capture", "cluster_c14")
+    tree = Tree(modes=registry)
+
+Electron capture reaches the same daughter as beta plus, so the two share out the (-1, 0) decays by energy instead
+of both taking them: registering electron_capture also swaps beta plus for a version that needs Q_EC > 2mₑc² (the
+positron has to be paid for), and electron capture takes 0 < Q_EC <= 2mₑc², where beta plus is forbidden. A parent
+never gets two children with the same daughter.
+
+Spontaneous fission is not in the table: it splits the nucleus into a distribution of fragments rather than one
+daughter at a fixed (ΔZ, ΔA).
+"""
+from binding_energy import AMU_TO_MEV, ELECTRON_MASS
+from nuclide_index import get_index
+
+POSITRON_THRESHOLD = 2 * ELECTRON_MASS * AMU_TO_MEV    # 2mₑc² in MeV, the Q_EC a beta plus decay needs
+
+
+class DecayMode:
+    """
+    allowed, if given, is called as allowed(Z, A, daughter Z, daughter A) and must work both on ints and on NumPy
+    arrays (TransitionTable calls it on the whole chart at once). Without it a decay is allowed when the daughter's
+    binding energy per nucleon is higher than the parent's, the rule the tree has always used.
+    emitted is the (Z, A) of the emitted particle, used for Q values; None for beta decays and electron capture.
+    extra_mass is any other mass in amu the Q value has to pay for (the positron and the spare atomic electron of
+    beta plus).
+    """
+    __slots__ = ("name", "label", "dz", "da", "title", "emitted", "allowed", "extra_mass")
+
+    def __init__(self, name, label, dz, da, title, emitted=None, allowed=None, extra_mass=0.0):
+        self.name = name
+        self.label = label
+        self.dz = dz
+        self.da = da
+        self.title = title
+        self.emitted = emitted
+        self.allowed = allowed
+        self.extra_mass = extra_mass
+
+    def daughter(self, atomic_number, mass_number):
+        return atomic_number + self.dz, mass_number + self.da
+
+    def __repr__(self):
+        return f"DecayMode({self.name!r}, {self.label!r}, {self.dz}, {self.da})"
+
+
+def capture_q(atomic_number, mass_number, daughter_atomic_number, daughter_mass_number):
+    # Q_EC in MeV from atomic masses; ints or NumPy arrays
+    mass = get_index().mass
+    return (mass[atomic_number, mass_number] - mass[daughter_atomic_number, daughter_mass_number]) * AMU_TO_MEV
+
+
+def positron_allowed(atomic_number, mass_number, daughter_atomic_number, daughter_mass_number):
+    """
+    Beta plus next to electron capture: the decay energy covers the positron and the spare atomic electron.
+    """
+    return capture_q(atomic_number, mass_number, daughter_atomic_number, daughter_mass_number) > POSITRON_THRESHOLD
+
+
+def capture_only(atomic_number, mass_number, daughter_atomic_number, daughter_mass_number):
+    """
+    Electron capture where beta plus is energetically forbidden.
+    """
+    q = capture_q(atomic_number, mass_number, daughter_atomic_number, daughter_mass_number)
+    return (q > 0) & (q <= POSITRON_THRESHOLD)
+
+
+ALPHA_DECAY = DecayMode("alpha", "α", -2, -4, "Alpha Decay", emitted=(2, 4))
+BETA_MINUS_DECAY = DecayMode("beta_minus", "β-", 1, 0, "Beta-Minus Decay")
+BETA_PLUS_DECAY = DecayMode("beta_plus", "β+", -1, 0, "Beta-Plus Decay", extra_mass=2 * ELECTRON_MASS)
+
+# modes that can be added to a registry by name
+EXTRA_MODES = {mode.name: mode for mode in (
+    DecayMode("electron_capture", "EC", -1, 0, "Electron Capture", allowed=capture_only),
+    DecayMode("proton_emission", "p", -1, -1, "Proton Emission", emitted=(1, 1)),
+    DecayMode("neutron_emission", "n", 0, -1, "Neutron Emission", emitted=(0, 1)),
+    DecayMode("double_beta_minus", "2β-", 2, 0, "Double Beta-Minus Decay"),
+    DecayMode("cluster_c14", "14C", -6, -14, "Carbon-14 Cluster Emission", emitted=(6, 14)),
+    DecayMode("cluster_ne24", "24Ne", -10, -24, "Neon-24 Cluster Emission", emitted=(10, 24)),
+)}
+
+# registering the key also replaces the registered mode of the same name with this version (see the module docstring)
+SPLITS = {"electron_capture": DecayMode("beta_plus", "β+", -1, 0, "Beta-Plus Decay", allowed=positron_allowed,
+                                        extra_mass=2 * ELECTRON_MASS)}
+
+
+class DecayModeRegistry:
+    """
+    Ordered, immutable collection of decay modes. A mode's position in the registry is its child index.
+    Time Complexity: O(1) lookups by index or name
+    """
+    def __init__(self, modes, build_order=None):
+        self.modes = tuple(modes)
+        self.build_order = tuple(range(len(self.modes))) if build_order is None else tuple(build_order)
+        if sorted(self.build_order) != list(range(len(self.modes))):
+            raise ValueError("build_order must list every mode index once")
+        self.index = {mode.name: position for position, mode in enumerate(self.modes)}
+
+    def __len__(self):
+        return len(self.modes)
+
+    def __iter__(self):
+        return iter(self.modes)
+
+    def __getitem__(self, position):
+        return self.modes[position]
+
+    @property
+    def labels(self):
+        return [mode.label for mode in self.modes]
+
+    def register(self, mode):
+        """
+        Returns a new registry with mode appended (stored and tried after the existing modes). A mode with an entry
+        in SPLITS also replaces the registered mode it shares its transitions with.
+        """
+        if mode.name in self.index:
+            raise ValueError(f"Decay mode {mode.name!r} is already registered")
+        modes = list(self.modes)
+        split = SPLITS.get(mode.name)
+        if split is not None and split.name in self.index:
+            modes[self.index[split.name]] = split
+        return DecayModeRegistry(modes + [mode], self.build_order + (len(self.modes),))
+
+    @classmethod
+    def with_modes(cls, *names):
+        """
+        Returns the default registry extended with EXTRA_MODES by name, eg. with_modes("electron_capture").
+        """
+        registry = DEFAULT_MODES
+        for name in names:
+            if name not in EXTRA_MODES:
+                raise ValueError(f"Unknown decay mode {name!r}, expected one of {', '.join(EXTRA_MODES)}")
+            registry = registry.register(EXTRA_MODES[name])
+        return registry
+
+
+DEFAULT_MODES = DecayModeRegistry((ALPHA_DECAY, BETA_MINUS_DECAY, BETA_PLUS_DECAY), build_order=(0, 2, 1))
+ALPHA, BETA_MINUS, BETA_PLUS = 0, 1, 2     # child indices of the default modes
@@ -0,0 +1,116 @@
+"""
+Persistent, incrementally extended decay network.
+
+A DecayNetwork keeps one decay DAG (a Tree built with dag=True) across queries. Adding a root only expands the
+nuclides the network has not reached yet, and widening the Z / A region resumes the expansion from the decays
+that had left the old region (the tree's frontier), so a sequence of queries costs about the work of the new
+region only. Nodes are never discarded or rebuilt, so the root nodes handed out earlier stay valid; after a
+widening they simply have more descendants, exactly as a fresh build in the wider region would.
+
+    network = DecayNetwork()
+    network.add_root("U", 92, 238)
+    network.add_root("U", 92, 235)            # shares everything U-238 already expanded
+    network.widen(z_min=70)                   # expands only the decays that used to leave Z 80-103
+    path = network.find_optimal_path(92, 238)
+"""
+from decay_modes import DEFAULT_MODES
+from decay_tree import MAX_DEPTH, Tree
+from nuclide_index import get_index
+from transition_table import TransitionTable
+
+
+class DecayNetwork:
+    """
+    With use_table=True every daughter comes from a TransitionTable over the whole chart, which is built once and
+    never has to change when the region is widened.
+    Time Complexity: O(new nuclides + their edges) per add_root / widen call
+    """
+    def __init__(self, z_min=80, z_max=103, a_min=1, a_max=None, use_table=False, depth_limit=MAX_DEPTH, modes=None):
+        modes = DEFAULT_MODES if modes is None else modes
+        transitions = TransitionTable(0, get_index().max_z, modes) if use_table else None
+        self.tree = Tree(depth_limit=depth_limit, transitions=transitions, z_min=z_min, z_max=z_max, a_min=a_min,
+                         a_max=a_max, modes=modes)
+        self.tree.frontier = []       # decays that left the region, resumed by widen
+        self.roots = {}               # (Z, A) -> root TreeNode, None while the root is outside the region
+        self.pending_roots = {}       # (Z, A) -> symbol of roots waiting for the region to include them
+
+    def __len__(self):
+        return len(self.tree.nodes)
+
+    def __contains__(self, key):
+        return key in self.tree.nodes
+
+    @property
+    def region(self):
+        return self.tree.z_min, self.tree.z_max, self.tree.a_min, self.tree.a_max
+
+    def add_root(self, symbol, atomic_number, mass_number):
+        """
+        Expands the network from the nuclide (Z, A) and returns its node. A root outside the current region
+        returns None and is expanded by a later widen that covers it.
+        """
+        key = (atomic_number, mass_number)
+        if key in self.roots and self.roots[key] is not None:
+            return self.roots[key]
+        node = self.tree.build_tree(symbol, atomic_number, mass_number, dag=True)
+        self.roots[key] = node
+        if node is None:
+            self.pending_roots[key] = symbol
+        return node
+
+    def widen(self, z_min=None, z_max=None, a_min=None, a_max=None):
+        """
+        Widens the region (a bound left as None is unchanged) and expands everything that becomes reachable.
+        Returns the number of nodes created. Raises ValueError if a bound would shrink the region.
+        """
+        tree = self.tree
+        bounds = (tree.z_min if z_min is None else z_min, tree.z_max if z_max is None else z_max,
+                  tree.a_min if a_min is None else a_min, tree.a_max if a_max is None else a_max)
+        if (bounds[0] > tree.z_min or bounds[1] < tree.z_max or bounds[2] > tree.a_min or
+                (bounds[3] is not None and (tree.a_max is None or bounds[3] < tree.a_max))):
+            raise ValueError("widen can only grow the region")
+        tree.z_min, tree.z_max, tree.a_min, tree.a_max = bounds
+
+        before = tree.node_counter
+        frontier, tree.frontier = tree.frontier, []
+        for parent, mode, symbol, atomic_number, mass_number, depth in frontier:
+            if not tree.in_region(atomic_number, mass_number):
+                tree.frontier.append((parent, mode, symbol, atomic_number, mass_number, depth))
+                continue
+            child, created = tree._add_node(symbol, atomic_number, mass_number, depth + 1, True)
+            parent.set_child(mode, child)
+            if created:
+                tree._expand([[child, symbol, atomic_number, mass_number, depth + 1, 0]], True)
+
+        for key, symbol in list(self.pending_roots.items()):
+            if tree.in_region(*key):
+                del self.pending_roots[key]
+                self.roots[key] = tree.build_tree(symbol, key[0], key[1], dag=True)
+        return tree.node_counter - before
+
+    def root(self, atomic_number, mass_number):
+        """
+        Returns the node of a root added earlier (None if it is still outside the region).
+        """
+        return self.roots[(atomic_number, mass_number)]
+
+    def node(self, atomic_number, mass_number):
+        """
+        Returns the node of any nuclide in the network, or None.
+        """
+        return self.tree.nodes.get((atomic_number, mass_number))
+
+    def iter_levels(self, atomic_number, mass_number, max_depth=None, max_nodes=None):
+        """
+        Streams the levels below (Z, A), like Tree.iter_levels.
+        """
+        return self.tree.iter_levels(self.node(atomic_number, mass_number), max_depth, max_nodes)
+
+    def find_optimal_path(self, atomic_number, mass_number, objective="final_be"):
+        """
+        Returns the optimal path (list of TreeNodes) from (Z, A) through the current network, like
+        Tree.find_optimal_path. The path bookkeeping of the shared tree is reset first, so earlier queries do
+        not leak into this one.
+        """
+        self.tree.reset_path()
+        return self.tree.find_optimal_path(self.node(atomic_number, mass_number), objective)
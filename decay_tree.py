@@ -0,0 +1,764 @@
+"""
+Core decay tree classes: Element, ElementList, TreeNode and Tree.
+
+Importing this module has no side effects. Graphviz and fpdf are only imported by Tree.visualize_tree and
+Tree.generate_pdf, so building trees and searching paths never pays for the rendering libraries.
+main_2.py is the command line front end.
+"""
+import operator
+from collections import deque
+
+from binding_energy import get_service
+from decay_modes import ALPHA, BETA_MINUS, BETA_PLUS, DEFAULT_MODES
+from nuclide_index import get_index
+from q_values import get_table
+
+# Builders and traversals use explicit stacks, so deep chains are bounded by this guard instead of the C stack
+MAX_DEPTH = 10000
+
+
+class Element:
+    """
+    Record holding each property/feature of an element. Every property is a small Node (prop, value) and the nodes
+    are still linked head -> tail like the original singly linked list, but the record uses __slots__ and indexing
+    goes straight to the field instead of walking the list.
+
+    The four nodes of a nuclide never change once built, so they are created once per (symbol, Z, A) and shared by
+    every Element of that nuclide; a tree with thousands of copies of Pb-207 holds one set of nodes. Assigning
+    through [] gives the record its own copy first, so it never affects other records. Assigning node.value
+    directly changes every record of that nuclide.
+    Node structure is as below
+    """
+    class Node():                                     #Node definition for Element class
+        __slots__ = ("prop", "value", "next")
+
+        def __init__(self, prop, value):
+            self.prop = prop
+            self.value = value
+            self.next = None
+
+    __slots__ = ("symbol", "atomic_number", "mass_number", "binding_energy")
+    _fields = __slots__                               # index -> field name for [] access
+    _shared = {}                                      # (symbol, Z, A) -> the four linked nodes of that nuclide
+    size = 4
+    
+    def __init__(self, element, atomic_no, mass_no):       #initialization populates the entire list. Binding energy is calculated by pre-defined function
+        nodes = Element._shared.get((element, atomic_no, mass_no))
+        if nodes is None:
+            nodes = self._link(element, atomic_no, mass_no, self.calculate_binding_energy(element, atomic_no, mass_no))
+            Element._shared[(element, atomic_no, mass_no)] = nodes
+        self.symbol, self.atomic_number, self.mass_number, self.binding_energy = nodes
+
+    def _link(self, element, atomic_no, mass_no, binding_energy):
+        symbol = self.Node("Symbol", element)
+        atomic_number = symbol.next = self.Node("Atomic Number", atomic_no)
+        mass_number = atomic_number.next = self.Node("Mass Number", mass_no)
+        binding = mass_number.next = self.Node("Binding Energy", binding_energy)
+        return symbol, atomic_number, mass_number, binding
+
+    @property
+    def head(self):
+        return self.symbol
+
+    @property
+    def tail(self):
+        return self.binding_energy
+
+    def __getitem__(self, key):
+        """
+        This is a magic method in python. We can compare it to operator overloading in the sense that this function allows us to
+        use the [] operators and helps us index the record.
+
+        Time complexity to get the item of an index: O(1), the index selects the field directly
+        """
+        if type(key) is not int:                               #validating the index to see if it is an integer
+            try:
+                key = operator.index(key)                      #numpy integers and other int-like indexes
+            except TypeError:
+                print("Error: Not a number")
+                return
+        if 0 > key or key >= 4:                                #validating to check if the index is within bounds NOTE negative index support not added
+            print("Error: Index out of bounds")
+            return
+        return getattr(self, self._fields[key]).value
+        
+    def __setitem__(self, key, value):
+        """
+        This method also overrides [] operator and allows modifying a node/ object accessed at given index
+        Time Complexity: O(1) for similar reasons as __getitem__
+        """
+        if type(key) is not int:
+            try:
+                key = operator.index(key)
+            except TypeError:
+                raise TypeError("Index must be an integer")
+        if  0 > key or key >= 4:
+            raise ValueError("Index out of bounds")
+        values = [self.symbol.value, self.atomic_number.value, self.mass_number.value, self.binding_energy.value]
+        values[key] = value
+        self.symbol, self.atomic_number, self.mass_number, self.binding_energy = self._link(*values)   #private copy
+
+    def __str__(self) -> str: 
+        """
+        Also a magic method, this returns the string format of the list whenever needed. Eg. 
+        Sodium = Element("Na", 11, 23)
+        print(Sodium)
+
+        Sample O/P
+        [Na, 11, 23, 7.87]
+        """
+        return "[" + str(self.symbol.value) + ", " + str(self.atomic_number.value) + ", " + str(self.mass_number.value) +", " + str(self.binding_energy.value) + "]"
+    
+    def calculate_binding_energy(self, atom, atomic_number, mass_number):
+        """
+        Function to calculate the binding energy per nucleon based on the mass no and atomic no
+        Time Complexity: O(1) - served by the shared binding energy cache
+        """
+        return get_service().per_nucleon(atomic_number, mass_number)
+
+class ElementList:
+    """
+    List of the elements on a decay path, stored in one contiguous Python list of small Node records so that
+    indexing is O(1). It used to be a doubly linked list; head and tail are still available.
+
+    Deleting by element marks the slot empty (O(1) through the index of positions per element symbol); the empty
+    slots are squeezed out the next time the list is indexed or iterated.
+    Node structure is as below
+    """
+    class Node():
+        """
+        Each feature of the element is a separate data member.
+        """
+        __slots__ = ("element", "atomic_no", "mass_no", "binding_energy", "key")
+
+        def __init__(self, element, atomic_no=0, mass_no=0, binding_energy=0):
+            self.element = element
+            self.atomic_no = atomic_no
+            self.mass_no = mass_no
+            self.binding_energy = binding_energy
+            self.key = element
+
+    def __init__(self):
+        self.nodes = []               # contiguous storage, None marks a deleted slot
+        self.positions = {}           # element symbol -> deque of its slot positions, in order
+        self.size = 0
+
+    def _compact(self):
+        # drop deleted slots and rebuild the position index, O(n) but only after deletions
+        if len(self.nodes) != self.size:
+            self.nodes = [node for node in self.nodes if node is not None]
+            self.positions = {}
+            for i, node in enumerate(self.nodes):
+                self.positions.setdefault(node.key, deque()).append(i)
+
+    @property
+    def head(self):
+        self._compact()
+        return self.nodes[0] if self.nodes else None
+
+    @property
+    def tail(self):
+        self._compact()
+        return self.nodes[-1] if self.nodes else None
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        self._compact()
+        return iter(self.nodes)
+
+    def __getitem__(self, key):
+        """
+        This is a magic method in python. We can compare it to operator overloading in the sense that this function allows us to
+        use the [] operators and helps us index the list.
+
+        Time complexity to get the item of an index: O(1), a direct list access
+        """
+        if type(key) is not int:
+            try:
+                key = operator.index(key)
+            except TypeError:
+                raise TypeError("Index must be an integer")
+        if key >= self.size or key <0:
+            raise ValueError("Index out of bounds")
+
+        self._compact()
+        return self.nodes[key]
+        
+    def __setitem__(self, key, value):
+        """
+        This method also overrides [] operator and allows modifying a node/ object accessed at given index
+        Time Complexity: O(1) apart from keeping the element index up to date
+        """
+        node = self[key]
+        self.positions[node.key].remove(key)
+        node.element = node.key = value
+        slots = self.positions.setdefault(value, deque())
+        slots.append(key)
+        if len(slots) > 1 and slots[-2] > key:
+            self.positions[value] = deque(sorted(slots))
+
+    def addnode(self, element, atomic_no, mass_no, binding_energy=None):
+        """
+        Function to add nodes to the list. Gets the element, atomic no, mass no as the inputs; the symbol is taken
+        from the atomic number. An already known total binding energy can be passed in to skip the lookup.
+        Time Complexity: O(1) amortized
+        """
+        symbol = get_index().symbol(atomic_no) if atomic_no > 0 else None
+
+        if symbol:
+            if binding_energy is None:
+                binding_energy = self.calculate_binding_energy(symbol, atomic_no, mass_no)
+            self._append(self.Node(symbol, atomic_no, mass_no, binding_energy))
+        else:
+            print("Error: Element not found in periodic table")
+
+    def _append(self, node):
+        self.positions.setdefault(node.key, deque()).append(len(self.nodes))
+        self.nodes.append(node)
+        self.size += 1
+
+    def extend(self, path):
+        """
+        Appends every TreeNode of an already built path in one go. Symbols come from the tree nodes and the
+        binding energies from the cache that was filled while the tree was built.
+        Time Complexity: O(k) for k nodes
+        """
+        for tree_node in path:
+            value = tree_node.value
+            atomic_no, mass_no = value.atomic_number.value, value.mass_number.value
+            self._append(self.Node(value.symbol.value, atomic_no, mass_no,
+                                   get_service().total(atomic_no, mass_no)))
+
+    def delnode(self, element):
+        """
+        Deletes the first node holding the given element symbol.
+        Time Complexity: O(1) amortized - the slot is found through the index and only marked empty
+        """
+        slots = self.positions.get(element)
+        if not slots:
+            print("Error: Element not in list")
+            return
+        self.nodes[slots.popleft()] = None
+        self.size -= 1
+
+    def __str__(self) -> str:
+        """
+        Method to provide the string representation of the ElementList class"""
+        return str([str([node.element, node.atomic_no, node.mass_no]) for node in self])
+    
+    def calculate_binding_energy(self, atom, atomic_number, mass_number):
+        """
+        Function to calculate the total binding energy based on the mass no and atomic no
+        Time Complexity: O(1) - served by the shared binding energy cache
+        """
+        return get_service().total(atomic_number, mass_number)
+
+class TreeNode:
+    """
+    Children are kept in a list indexed by decay mode (the position of the mode in the tree's DecayModeRegistry).
+    A leaf shares the empty tuple and the list only grows as far as the highest mode that has a child.
+    left / middle / right are the alpha / beta minus / beta plus children of the default modes.
+    """
+    __slots__ = ("value", "node_id", "children")
+
+    def __init__(self, element, atomic_number, mass_number, node_id):  # node structure of the tree
+        self.value = Element(element, atomic_number, mass_number)
+        self.node_id = node_id
+        self.children = ()
+
+    def child(self, mode):
+        children = self.children
+        return children[mode] if mode < len(children) else None
+
+    def set_child(self, mode, child):
+        children = self.children
+        if len(children) <= mode:
+            children = self.children = list(children) + [None] * (mode + 1 - len(children))
+        children[mode] = child
+
+    left = property(lambda self: self.child(ALPHA), lambda self, child: self.set_child(ALPHA, child))           # alpha decay
+    middle = property(lambda self: self.child(BETA_MINUS), lambda self, child: self.set_child(BETA_MINUS, child)) # beta minus
+    right = property(lambda self: self.child(BETA_PLUS), lambda self, child: self.set_child(BETA_PLUS, child))    # beta plus
+
+class Tree:
+    def __init__(self, depth_limit=MAX_DEPTH, transitions=None, metrics=None, z_min=80, z_max=103, a_min=1,
+                 a_max=None, modes=None):      # constructor of tree class
+        self.root = None
+        self.modes = DEFAULT_MODES if modes is None else modes   # DecayModeRegistry the tree is built with
+        if transitions is not None and transitions.modes is not self.modes:
+            raise ValueError("The TransitionTable was built for a different DecayModeRegistry")
+        if transitions is not None and not transitions.z_min <= z_min <= z_max <= transitions.z_max:
+            # the table holds no decay out of its window, so a wider region would silently lose daughters
+            raise ValueError(f"The TransitionTable covers Z {transitions.z_min}-{transitions.z_max}, not the studied "
+                             f"region Z {z_min}-{z_max}")
+        self.max_depth = 0
+        self.depth_limit = depth_limit   # deepest chain build_tree may create before failing
+        self.z_min, self.z_max = z_min, z_max   # studied region; decays leaving it end the chain
+        self.a_min, self.a_max = a_min, a_max   # a_max None means no upper bound
+        self.frontier = None             # list of decays that left the region, recorded when not None
+        self.handoff = None              # list of frames deeper than split_depth left unexpanded, when not None
+        self.split_depth = None          # (used by parallel_build to hand subtrees to worker processes)
+        self.transitions = transitions   # optional precomputed TransitionTable, replaces per-node lookups
+        self.qvalues = get_table(self.modes)   # Q value and allowed flag of every (nuclide, mode), see q_values.py
+        self.q_labels = False         # also print each edge's Q value in the drawings
+        self.e = ElementList()
+        self.node_counter = 0
+        self.nodes = {}               # transposition table (Z, A) -> TreeNode used when building a DAG
+        self.optimal_path_nodes = []  # Store nodes in the optimal path
+        self.optimal_path_edges = []  # Store edges in the optimal path
+        self.optimal_node_ids = set() # id(node) of every node on the optimal path, for O(1) highlighting
+        self.optimal_edge_ids = set() # (id(parent), id(child)) of every edge on the optimal path
+        self.metrics = None           # optional metrics.Metrics, see enable_metrics
+        if metrics is not None:
+            self.enable_metrics(metrics)
+
+    def enable_metrics(self, metrics):
+        '''
+        Starts recording phase times and counters into metrics (a metrics.Metrics). The timed methods are wrapped
+        on this instance only, so trees without metrics are not slowed down at all.
+        '''
+        self.metrics = metrics
+        self._nuclides_seen = set()   # (Z, A) already created, to count duplicate nuclides in tree mode
+        for method, phase in (("find_element", "lookup"), ("decay_allowed", "binding_energy"),
+                              ("compare_calculate_mass_defect", "binding_energy"),
+                              ("build_tree", "build"), ("iter_levelorder", "traversal"), ("get_path", "path"),
+                              ("find_optimal_path", "path"), ("visualize_tree", "dot"), ("write_dot", "dot"),
+                              ("generate_pdf", "pdf")):
+            metrics.instrument(self, method, phase)
+
+    def reset_path(self):
+        '''
+        Forgets the optimal path recorded by get_path / find_optimal_path (self.e and the highlighting), so a tree
+        that is searched again only shows the latest path.
+        '''
+        self.e = ElementList()
+        self.optimal_path_nodes, self.optimal_path_edges = [], []
+        self.optimal_node_ids, self.optimal_edge_ids = set(), set()
+
+    def _mark_node(self, node):
+        # records a node of the optimal path in the list and in the id set used for highlighting
+        self.optimal_path_nodes.append(node)
+        self.optimal_node_ids.add(id(node))
+
+    def _mark_edge(self, node, child, relation):
+        self.optimal_path_edges.append((node, child, relation))
+        if child is not None:
+            self.optimal_edge_ids.add((id(node), id(child)))
+
+    def find_element(self, atomic_number, mass_number):   #finding element based on given atomic and mass number
+    #time complexity O(1) - single lookup in the shared (Z, A) nuclide index
+        return get_index().find_element(atomic_number, mass_number)
+    
+    def alpha_decay(self, atomic_number, mass_number):   #function for alpha decay
+        return atomic_number - 2, mass_number - 4
+    
+    def beta_minus(self, atomic_number, mass_number):   #function for beta minus decay
+        return atomic_number + 1, mass_number
+    
+    def beta_plus(self, atomic_number, mass_number):    #function for beta plus decay
+        return atomic_number - 1, mass_number
+    
+    def compare_calculate_mass_defect(self, atom1, atomic_number1, mass_number1, atom, atomic_number, mass_number):
+         '''
+         Function to compare the binding energy of 2 elements. Only if the binding energy of the product 
+         element greater than the reactant element, the child is created
+         
+         Time Complexity: O(1) - both values come from the shared binding energy cache, so the parent is
+                          only computed once no matter how many children it is compared against
+         '''
+         bepn = get_service().per_nucleon(atomic_number, mass_number)       #binding energy per nucleon of the child
+         bepn1 = get_service().per_nucleon(atomic_number1, mass_number1)    #binding energy per nucleon of the parent
+
+         if bepn1 < bepn:       # if the binding energy of product is higher, return 1
+             return 1
+         else:
+             return 0
+  
+    def decay_allowed(self, atomic_number, mass_number, mode):
+        '''
+        Returns True if the nuclide can decay by the mode (a registry index): the daughter is known and the mode's
+        filter accepts it, by default the same binding energy comparison as compare_calculate_mass_defect.
+        Time Complexity: O(1) - one lookup in the precomputed QValueTable
+        '''
+        return self.qvalues.is_allowed(atomic_number, mass_number, mode)
+
+    def in_region(self, atomic_number, mass_number):
+        return (self.z_min <= atomic_number <= self.z_max and mass_number >= self.a_min and
+                (self.a_max is None or mass_number <= self.a_max))
+
+    def _add_node(self, element, atomic_number, mass_number, depth, dag):
+        '''
+        Creates the node for a nuclide reached at the given depth. Returns (node, created); created is False when the
+        nuclide is outside the studied region (node is None) or already present in the DAG transposition table.
+        '''
+        if not self.in_region(atomic_number, mass_number):   # base condition to terminate
+            return None, False
+
+        if dag:
+            if (atomic_number, mass_number) in self.nodes:     # nuclide already expanded, share its node
+                if self.metrics is not None:
+                    self.metrics.count("duplicates")
+                return self.nodes[(atomic_number, mass_number)], False
+
+        if depth > self.depth_limit:
+            raise RuntimeError(f"Decay chain of {element}-{mass_number} exceeds the depth limit of {self.depth_limit}")
+
+        self.node_counter += 1
+        new_node = TreeNode(element, atomic_number, mass_number, self.node_counter)   #new node for given element
+        if dag:
+            self.nodes[(atomic_number, mass_number)] = new_node
+        self.max_depth = max(self.max_depth, depth)
+        if self.metrics is not None:
+            self._count_node(atomic_number, mass_number, depth)
+        return new_node, True
+
+    def _count_node(self, atomic_number, mass_number, depth):
+        self.metrics.count("nodes_created")
+        if (atomic_number, mass_number) in self._nuclides_seen:     # same nuclide reached by another route
+            self.metrics.count("duplicates")
+        else:
+            self._nuclides_seen.add((atomic_number, mass_number))
+        self.metrics.maximum("max_depth", depth)
+
+    def build_tree(self, element, atomic_number, mass_number, depth=0, dag=False):   #function to build tree
+        '''
+        Builds the decay tree rooted at the given nuclide.
+        With dag=True the transposition table self.nodes is consulted first, so every (Z, A) is expanded exactly
+        once and nuclides reachable through several decay routes share a single TreeNode (the result is a DAG).
+
+        The tree is built depth first with an explicit stack of frames instead of recursion. Decay modes are tried in
+        the build order of self.modes (by default alpha, beta plus, beta minus) and each child's subtree is finished
+        before the next decay mode of its parent is tried, so node ids and the DAG sharing are exactly those of the
+        recursive version.
+        Whether a decay is allowed is a single lookup in the QValueTable (decay_allowed). If the tree was given a
+        TransitionTable, the daughters are read from it instead.
+        Raises RuntimeError if a chain is deeper than self.depth_limit.
+        Time Complexity: O(3^d) as a tree, O(number of distinct nuclides) as a DAG
+        '''
+        root, created = self._add_node(element, atomic_number, mass_number, depth + 1, dag)
+        if not created:
+            return root
+
+        self._expand([[root, element, atomic_number, mass_number, depth + 1, 0]], dag)
+        return root
+
+    def _expand(self, stack, dag):
+        '''
+        Runs the depth first expansion of build_tree from the frames on stack ([node, symbol, Z, A, depth, next decay]).
+        Decays whose daughter is outside the region are appended to self.frontier, when it is a list, as
+        (parent node, mode index, symbol, Z, A, parent depth), so the expansion can be resumed after widening the region.
+        When self.handoff is a list, nodes created deeper than self.split_depth are appended to it as frames instead
+        of being expanded.
+        Time Complexity: O(number of modes) per node
+        '''
+        modes = self.modes
+        build_order = modes.build_order
+        frontier = self.frontier
+        handoff, split_depth = self.handoff, self.split_depth
+        while stack:
+            frame = stack[-1]
+            node, symbol, a_num, mass_num, node_depth, step = frame
+            if step == len(build_order):           # every decay mode tried, subtree complete
+                stack.pop()
+                continue
+            frame[5] += 1
+
+            mode = build_order[step]
+            if self.transitions is not None:
+                daughter = self.transitions.daughter(a_num, mass_num, mode)   #precomputed, already filtered
+                if daughter is None:
+                    continue
+                l, new_a_num, new_mass_num = daughter
+            else:
+                if not self.decay_allowed(a_num, mass_num, mode):     #known daughter with a higher binding energy
+                    continue
+                decay = modes[mode]
+                new_a_num, new_mass_num = a_num + decay.dz, mass_num + decay.da     #new atom after the decay
+                l = self.find_element(new_a_num, new_mass_num)       #finding atom symbol after decay
+
+            child, created = self._add_node(l, new_a_num, new_mass_num, node_depth + 1, dag)
+            if child is None:
+                if frontier is not None:
+                    frontier.append((node, mode, l, new_a_num, new_mass_num, node_depth))
+                continue
+            node.set_child(mode, child)
+            if created:
+                if handoff is not None and node_depth + 1 > split_depth:
+                    handoff.append([child, l, new_a_num, new_mass_num, node_depth + 1, 0])
+                else:
+                    stack.append([child, l, new_a_num, new_mass_num, node_depth + 1, 0])
+
+    def iter_levelorder(self, root, max_depth=None, max_nodes=None):
+        '''
+        Generator form of the level order traversal: yields (depth, node) pairs breadth first, the root at depth 1.
+        Uses a deque, so each step is O(1), and nothing is collected up front, so callers can stream the output
+        and stop early. Stops by itself after max_depth levels or max_nodes nodes.
+        Nodes shared in a DAG built with dag=True are yielded once, at the shallowest level they appear on
+        Time complexity: O(n) for the whole traversal, memory bounded by the widest level
+        '''
+        if root is None:
+            return
+        queue = deque([(root, 1)])
+        seen = {id(root)} if self.nodes else None       # only a DAG can reach a node twice
+        count = 0
+
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth > max_depth:
+                return
+            yield depth, node
+            count += 1
+            if max_nodes is not None and count >= max_nodes:
+                return
+            for child in node.children:
+                if child is None:
+                    continue
+                if seen is not None:
+                    if id(child) in seen:
+                        continue
+                    seen.add(id(child))
+                queue.append((child, depth + 1))
+
+    def iter_levels(self, root, max_depth=None, max_nodes=None):
+        '''
+        Yields the Element values of the tree one level at a time, as lists. Same early stopping as iter_levelorder.
+        '''
+        level = []
+        current = 1
+        for depth, node in self.iter_levelorder(root, max_depth, max_nodes):
+            if depth != current:
+                yield level
+                level = []
+                current = depth
+            level.append(node.value)
+        if level:
+            yield level
+
+    def levelorder(self, root):
+        '''
+        Level order traversal through the tree to get nodes at each level
+        The level order traversal is required to find the most optimal path to traverse through     
+        Returns a flat list of Element values with None after each level; use iter_levels to stream instead
+        Time complexity: O(n)
+        '''
+        q = []
+        for level in self.iter_levels(root):
+            q.extend(level)
+            q.append(None)
+        return q
+    
+    def get_path(self, root):
+        '''
+        This function is concerned about the most optimal path that the parent element (root node) can take to reach one of 
+        its leaf nodes.
+        The data of the elements through which traversal will happen is stored in a linked list
+        Time Complexicty: O(d) - depth of the tree, at any give point it will only travers one of the child nodes. 
+                                 So the worst case for this code is if the the node we need to reach is at the bottom
+                                 hence O(d). Every other operation is O(1). The walk is a plain loop, so no stack
+                                 frames are used however deep the path is.
+        '''
+        while root:
+            self._mark_node(root)  # Add node to optimal path
+            best_mode, best_dif = 0, None
+            for mode in range(len(self.modes)):   # a missing child counts as no gain; ties keep the first mode
+                child = root.child(mode)
+                dif = child.value.binding_energy.value - root.value.binding_energy.value if child is not None else 0
+                if best_dif is None or dif > best_dif:
+                    best_mode, best_dif = mode, dif
+
+            child = root.child(best_mode)
+            self._mark_edge(root, child, self.modes[best_mode].label)
+            root = child
+            
+            if root is not None:
+                self.e.addnode(root.value.symbol.value, root.value.atomic_number.value, root.value.mass_number.value)
+        
+    def find_optimal_path(self, root, objective="final_be"):
+        '''
+        Exact replacement for the greedy get_path. Scores every root-to-leaf path of the tree (or DAG) by dynamic
+        programming over the children, memoizing each node's best continuation so shared DAG nodes are solved once.
+        Objectives:
+            "final_be"     - highest binding energy per nucleon at the end of the path. Every step's gain
+                             telescopes, so this is also the largest total gain along the path
+            "fewest_steps" - shortest path to a terminal nuclide
+            "max_q"        - largest sum of the decay Q values (from self.qvalues) along the path
+        Ties keep the first child in registry order (by default alpha, beta minus, beta plus).
+        Like get_path it appends the path after the root to self.e and records optimal_path_nodes/edges for
+        visualize_tree. Returns the list of nodes on the path.
+        Time Complexity: O(V + E) - each node and edge is scored once
+        '''
+        if root is None:
+            return []
+        if objective not in ("final_be", "fewest_steps", "max_q"):
+            raise ValueError(f"Unknown objective: {objective}")
+
+        best = {}                    # id(node) -> (score, next node, relation); higher score is better
+        stack = [(root, False)]
+        while stack:                 # iterative post-order, children are scored before their parent
+            node, expanded = stack.pop()
+            if id(node) in best:
+                continue
+            children = [(child, mode) for mode, child in enumerate(node.children) if child is not None]
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child, _ in children if id(child) not in best)
+                continue
+
+            if not children:         # terminal nuclide
+                score = node.value.binding_energy.value if objective == "final_be" else 0
+                best[id(node)] = (score, None, None)
+                continue
+            choice = None
+            for child, mode in children:
+                score = best[id(child)][0]
+                if objective == "fewest_steps":
+                    score -= 1
+                elif objective == "max_q":
+                    score += self.qvalues.q_value(node.value.atomic_number.value, node.value.mass_number.value, mode)
+                if choice is None or score > choice[0]:
+                    choice = (score, child, self.modes[mode].label)
+            best[id(node)] = choice
+
+        path = [root]
+        self._mark_node(root)
+        node = root
+        while best[id(node)][1] is not None:
+            _, child, relation = best[id(node)]
+            self._mark_edge(node, child, relation)
+            self._mark_node(child)
+            path.append(child)
+            node = child
+        self.e.extend(path[1:])
+        return path
+
+    def get_max_recursion_depth(self):
+        return self.max_depth
+
+    def _drawing(self, root):
+        '''
+        Walks the tree in pre-order (children in registry order) from an explicit stack and yields what has to be
+        drawn, in order:
+            ("node", node_id, label, on_path)
+            ("edge", parent_id, node_id, relation, on_path)
+        Shared DAG nodes are yielded and expanded once, but every edge into them is yielded.
+        Membership of the optimal path is checked against the id sets, so each step is O(1).
+        '''
+        drawn = set()                  # nodes already emitted
+        stack = [(root, None, None)]   # node, parent, decay relation
+        while stack:
+            node, parent, relation = stack.pop()
+            if node is None:
+                continue
+            value = node.value
+            node_id = f"{value.symbol.value}_{value.atomic_number.value}_{value.mass_number.value}_{node.node_id}"
+            shared = id(node) in drawn
+            if not shared:
+                drawn.add(id(node))
+                label = f"{value.symbol.value}\nZ={value.atomic_number.value}\nA={value.mass_number.value}\nBE={value.binding_energy.value:.2f} MeV"
+                yield "node", node_id, label, id(node) in self.optimal_node_ids
+            if parent is not None:
+                yield "edge", parent[1], node_id, relation, (id(parent[0]), id(node)) in self.optimal_edge_ids
+            if shared:                 # subtree of a shared node has already been drawn
+                continue
+            parent = (node, node_id)
+            for mode in reversed(range(len(node.children))):      # pushed in reverse so the first mode is drawn first
+                relation = self.modes[mode].label
+                if self.q_labels and node.children[mode] is not None:
+                    relation += f"\nQ={self.qvalues.q_value(value.atomic_number.value, value.mass_number.value, mode):.2f} MeV"
+                stack.append((node.children[mode], parent, relation))
+
+    def visualize_tree(self, root):
+        '''
+        Draws the tree with Graphviz, visiting nodes in pre-order (children in registry order) from an explicit stack.
+        The optimal path recorded by get_path/find_optimal_path is highlighted in red.
+        Builds the whole graph in memory; use write_dot for very large trees
+        '''
+        return digraph_items(self._drawing(root))
+
+    def write_dot(self, root, out):
+        '''
+        Streams the same graph as visualize_tree straight to DOT text in one pass, without graphviz or an in-memory
+        Digraph, so trees with 10^5+ nodes export with flat memory. out is a file path or any object with a
+        write method (an open file, sys.stdout, the stdin of a `dot -Tsvg` subprocess).
+        Returns the number of nodes written.
+        Time complexity: O(n)
+        '''
+        return write_dot_items(self._drawing(root), out)
+
+    def generate_pdf(self, filepath="optimal_path.pdf"):
+        from fpdf import FPDF              # imported on demand, PDF export is optional
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+
+        for node in self.e:
+            line = f"Element: {node.element}, Atomic Number: {node.atomic_no}, Mass Number: {node.mass_no}, Binding Energy: {node.binding_energy:.2f} MeV"
+            pdf.cell(200, 10, txt=line, ln=True, align='L')
+        
+        pdf.output(filepath)
+
+def write_dot_items(items, out):
+    '''
+    Writes the ("node", ...) / ("edge", ...) items of a drawing walk (Tree._drawing, DecayGraph._drawing) as DOT
+    text to out, a file path or an object with a write method. Returns the number of nodes written.
+    '''
+    if not hasattr(out, "write"):
+        with open(out, "w", encoding="utf-8") as f:
+            return write_dot_items(items, f)
+
+    nodes = 0
+    out.write("digraph {\n")
+    for item in items:
+        if item[0] == "node":
+            _, node_id, label, on_path = item
+            style = " color=red fillcolor=yellow style=filled" if on_path else ""
+            out.write(f"\t{node_id} [label={_dot_quote(label)}{style}]\n")
+            nodes += 1
+        else:
+            _, parent_id, node_id, relation, on_path = item
+            style = " color=red penwidth=2" if on_path else ""
+            out.write(f"\t{parent_id} -> {node_id} [label={_dot_quote(relation)}{style}]\n")
+    out.write("}\n")
+    return nodes
+
+def digraph_items(items):
+    '''
+    Builds a graphviz Digraph from the ("node", ...) / ("edge", ...) items of a drawing walk (Tree._drawing,
+    DecayGraph._drawing), with the optimal path highlighted in red. The in-memory counterpart of write_dot_items.
+    '''
+    from graphviz import Digraph       # imported on demand, rendering is optional
+
+    dot = Digraph()
+    for item in items:
+        if item[0] == "node":
+            _, node_id, label, on_path = item
+            if on_path:
+                dot.node(node_id, label, color='red', style='filled', fillcolor='yellow')
+            else:
+                dot.node(node_id, label)
+        else:
+            _, parent_id, node_id, relation, on_path = item
+            if on_path:
+                dot.edge(parent_id, node_id, label=relation, color='red', penwidth='2')
+            else:
+                dot.edge(parent_id, node_id, label=relation)
+    return dot
+
+def _dot_quote(text):
+    # DOT string literal; line breaks become the \n escape Graphviz centres lines on
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+def check_element_exists(symbol, atomic_number, mass_number):
+    '''
+    Function to check if the element actually exists in periodic table
+    If element symbolis correct, atomic number and mass number are also verified.
+    Isotopes are also taken in consideration
+    If all 3 user inputs are correct, the tree is built and operations are performed.
+    Otherwise an error is raised
+    
+    Time Complexity: O(1) - lookups in the shared (Z, A) nuclide index
+    '''
+    return get_index().check_element(symbol, atomic_number, mass_number)
@@ -1,4 +1,5 @@
 import periodictable
+from binding_energy import get_service
 
 class Element:
     class Node():
@@ -49,21 +50,7 @@ class Element:
         return str([self.head.value, self.head.next.value, self.head.next.next.value])
     
     def calculate_binding_energy(self,atom, atomic_number, mass_number):
-     #calculations for child node
-        element = getattr(periodictable, atom)
-        protons = atomic_number
-        neutrons = mass_number - atomic_number
-        mass = 0
-        
-        total_mass_atom = (protons * 1.007276) + (neutrons * 1.008665)
-        for isotopes in element:
-            if str(isotopes)[:3:] == str(mass_number):
-                mass = isotopes.mass
-        mass_defect = total_mass_atom - mass
-        #bepn denotes binding energy per nucleon
-        #931.5 MeV is the energy for 1 amu
-        bepn = mass_defect * (931.5) / mass_number
-        return bepn
+        return get_service().per_nucleon(atomic_number, mass_number)
     
 #doubly linked implementation for storing details of each element in each node (final fission path)
 class ElementList:
@@ -136,35 +123,24 @@ class ElementList:
     
     
     def delnode(self, element):
+        # removes the first node holding the element; addnode only links forward, so track the previous node here
         if self.head == None:
             print("Error: List is empty")
         else:
+            prev = None
             node = self.head
-            for _ in range(self.size):
+            while node is not None:
                 if node.element == element:
-                    if self.head.element == element:
-                        self.head = self.head.next
-                        self.head.next.prev = None
-                    elif self.tail.element == element:
-                        self.tail = self.tail.prev
-                        self.tail.next = None
+                    if prev is None:
+                        self.head = node.next
                     else:
-                        node.prev.next = node.next
-                        node.next.prev = node.prev
+                        prev.next = node.next
+                    if node is self.tail:
+                        self.tail = prev
+                    self.size -= 1
+                    return
+                prev = node
+                node = node.next
     
-    def calculate_binding_energy(atom, atomic_number, mass_number):
-        #calculations for child node
-        element = getattr(periodictable, atom)
-        protons = atomic_number
-        neutrons = mass_number - atomic_number
-        mass = 0
-        
-        total_mass_atom = (protons * 1.007276) + (neutrons * 1.008665)
-        for isotopes in element:
-            if str(isotopes)[:3:] == str(mass_number):
-                mass = isotopes.mass
-        mass_defect = total_mass_atom - mass
-        
-        #931.5 MeV is the energy for 1 amu
-        be = mass_defect * (931.5) 
-        return be
\ No newline at end of file
+    def calculate_binding_energy(self, atom, atomic_number, mass_number):
+        return get_service().total(atomic_number, mass_number)
\ No newline at end of file
@@ -1,9 +1,10 @@
 import periodictable
-import sys
 import time
+from binding_energy import get_service
+from nuclide_index import get_index
 
-# Increase recursion limit
-sys.setrecursionlimit(10000)
+# Deepest chain build_tree may create; the builder uses an explicit stack, not recursion
+MAX_DEPTH = 10000
    
 
 class Element:
@@ -55,21 +56,7 @@ class Element:
         return str([self.head.value, self.head.next.value, self.head.next.next.value,self.head.next.next.next.value])
     
     def calculate_binding_energy(self,atom, atomic_number, mass_number):
-     #calculations for child node
-        element = getattr(periodictable, atom)
-        protons = atomic_number
-        neutrons = mass_number - atomic_number
-        mass = 0
-        
-        total_mass_atom = (protons * 1.007276) + (neutrons * 1.008665)
-        for isotopes in element:
-            if str(isotopes)[:3:] == str(mass_number):
-                mass = isotopes.mass
-        mass_defect = total_mass_atom - mass
-        #bepn denotes binding energy per nucleon
-        #931.5 MeV is the energy for 1 amu
-        bepn = mass_defect * (931.5) / mass_number
-        return bepn
+        return get_service().per_nucleon(atomic_number, mass_number)
 class ElementList:
     class Node():
         def __init__(self, element, atomic_no=0, mass_no=0, binding_energy=0):
@@ -140,21 +127,24 @@ class ElementList:
     
     
     def delnode(self, element):
+        # removes the first node holding the element; addnode only links forward, so track the previous node here
         if self.head == None:
             print("Error: List is empty")
         else:
+            prev = None
             node = self.head
-            for _ in range(self.size):
+            while node is not None:
                 if node.element == element:
-                    if self.head.element == element:
-                        self.head = self.head.next
-                        self.head.next.prev = None
-                    elif self.tail.element == element:
-                        self.tail = self.tail.prev
-                        self.tail.next = None
+                    if prev is None:
+                        self.head = node.next
                     else:
-                        node.prev.next = node.next
-                        node.next.prev = node.prev
+                        prev.next = node.next
+                    if node is self.tail:
+                        self.tail = prev
+                    self.size -= 1
+                    return
+                prev = node
+                node = node.next
     def __str__(self) -> str:
         l = []
         node = self.head
@@ -164,21 +154,7 @@ class ElementList:
         return str(l)
     
     def calculate_binding_energy(self, atom, atomic_number, mass_number):
-        #calculations for child node
-        element = getattr(periodictable, atom)
-        protons = atomic_number
-        neutrons = mass_number - atomic_number
-        mass = 0
-        
-        total_mass_atom = (protons * 1.007276) + (neutrons * 1.008665)
-        for isotopes in element:
-            if str(isotopes)[:3:] == str(mass_number):
-                mass = isotopes.mass
-        mass_defect = total_mass_atom - mass
-        
-        #931.5 MeV is the energy for 1 amu
-        be = mass_defect * (931.5) 
-        return be
+        return get_service().total(atomic_number, mass_number)
 # Basic node structure of a tree    
 class TreeNode:
     def __init__(self, element, atomic_number, mass_number):
@@ -195,11 +171,7 @@ class Tree:
         self.e = ElementList()
 
     def find_element(self, atomic_number, mass_number):
-        element = periodictable.elements[atomic_number]
-        for i in element:
-            if str(i)[:3] == str(mass_number):
-                return i.symbol
-        return None
+        return get_index().find_element(atomic_number, mass_number)
     
     def alpha_decay(self, atomic_number, mass_number):
         return atomic_number - 2, mass_number - 4
@@ -211,35 +183,9 @@ class Tree:
         return atomic_number - 1, mass_number
     
     def compare_calculate_mass_defect(self, atom1, atomic_number1, mass_number1, atom, atomic_number, mass_number):
-         #calculations for child node
-         element = getattr(periodictable, atom)
-         protons = atomic_number
-         neutrons = mass_number - atomic_number
-         mass = 0
-         
-         total_mass_atom = (protons * 1.007276) + (neutrons * 1.008665)
-         for isotopes in element:
-             if str(isotopes)[:3:] == str(mass_number):
-                 mass = isotopes.mass
-         mass_defect = total_mass_atom - mass
-         #bepn denotes binding energy per nucleon
-         #931.5 MeV is the energy for 1 amu
-         bepn = mass_defect * (931.5) / mass_number
-         
-         
-         #calculations for parent node
-         element = getattr(periodictable, atom1)
-         protons = atomic_number1
-         neutrons = mass_number1 - atomic_number1
-         mass1 = 0
-         total_mass_atom1 = (protons * 1.007276) + (neutrons * 1.008665)
-         for isotopes in element:
-             if str(isotopes)[:3:] == str(mass_number1):
-                 mass1 = isotopes.mass
-         mass_defect = total_mass_atom1 - mass1
-         bepn1 = mass_defect * (931.5) / mass_number1
-         
-         
+         bepn = get_service().per_nucleon(atomic_number, mass_number)       #child
+         bepn1 = get_service().per_nucleon(atomic_number1, mass_number1)    #parent
+
          if bepn1 < bepn:
              return 1
          else:
@@ -250,37 +196,35 @@ class Tree:
         if atomic_number < 80 or mass_number <= 0 or atomic_number > 103:
             return None
         
-        new_node = TreeNode(element, atomic_number, mass_number)
-        #print("Node created:",new_node.value)
+        root = TreeNode(element, atomic_number, mass_number)
+        self.max_depth = max(self.max_depth, depth + 1)
         
-        depth += 1
-        
-        # Update maximum recursion depth
-        self.max_depth = max(self.max_depth, depth)
-        
-        # Building left tree for alpha decay
-        new_a_num, new_mass_num = self.alpha_decay(atomic_number, mass_number)
-        
-        l = self.find_element(new_a_num, new_mass_num)
-        if l is not None:
-            if self.compare_calculate_mass_defect(new_node.value[0], new_node.value[1], new_node.value[2], l, new_a_num, new_mass_num):
-                new_node.left = self.build_tree(l, new_a_num, new_mass_num, depth)
-          
-        # Building right tree for beta plus decay
-        new_a_num, new_mass_num = self.beta_plus(atomic_number, mass_number)
-        l = self.find_element(new_a_num, new_mass_num)
-        if l is not None:
-            if self.compare_calculate_mass_defect(new_node.value[0], new_node.value[1], new_node.value[2], l, new_a_num, new_mass_num):
-                new_node.right = self.build_tree(l, new_a_num, new_mass_num, depth)
-                
-        # Building middle tree for beta minus decay
-        new_a_num, new_mass_num = self.beta_minus(atomic_number, mass_number)
-        l = self.find_element(new_a_num, new_mass_num)
-        if l is not None:
-            if self.compare_calculate_mass_defect(new_node.value[0], new_node.value[1], new_node.value[2], l, new_a_num, new_mass_num):
-                new_node.middle = self.build_tree(l, new_a_num, new_mass_num, depth)
+        # Depth first with an explicit stack. Each frame remembers which decay to try next, so every subtree is
+        # finished before its parent's next decay is tried, exactly like the recursive version
+        decays = ((self.alpha_decay, 'left'), (self.beta_plus, 'right'), (self.beta_minus, 'middle'))
+        stack = [[root, element, atomic_number, mass_number, depth + 1, 0]]
+        while stack:
+            frame = stack[-1]
+            node, symbol, a_num, mass_num, node_depth, mode = frame
+            if mode == len(decays):
+                stack.pop()
+                continue
+            frame[5] += 1
+            
+            decay, branch = decays[mode]
+            new_a_num, new_mass_num = decay(a_num, mass_num)
+            l = self.find_element(new_a_num, new_mass_num)
+            if l is not None and 80 <= new_a_num <= 103 and new_mass_num > 0:
+                if self.compare_calculate_mass_defect(symbol, a_num, mass_num, l, new_a_num, new_mass_num):
+                    if node_depth + 1 > MAX_DEPTH:
+                        raise RuntimeError(f"Decay chain of {element}-{mass_number} is deeper than {MAX_DEPTH}")
+                    child = TreeNode(l, new_a_num, new_mass_num)
+                    setattr(node, branch, child)
+                    # Update maximum depth
+                    self.max_depth = max(self.max_depth, node_depth + 1)
+                    stack.append([child, l, new_a_num, new_mass_num, node_depth + 1, 0])
         
-        return new_node
+        return root
     
     def levelorder(self, root):
         l = []
@@ -310,14 +254,14 @@ class Tree:
         return q
     
     '''
-    get_path(root): Recursively explores the tree, selecting the child node with the highest increase in binding energy.
+    get_path(root): Walks down the tree, selecting the child node with the highest increase in binding energy.
 	Maintains a list ⁠ElementList⁠ to track the elements in the optimal path.
     Worst Case Time complexicty: O(d), d - depth of the tree, at any give point it will only travers one of the 3 child nodes. 
                                            So the worst case for this code is if the the node we need to reach is at the bottom
-                                           hence O(d). Every other operation is O(1). due to the use of recursion it becomes O(d)
+                                           hence O(d). Every other operation is O(1). Implemented as a loop, so no recursion is needed
     '''
     def get_path(self, root):
-        if root:
+        while root:
             
             dif1=dif2=dif3=0
             if root.left is not None:
@@ -339,50 +283,41 @@ class Tree:
             # print(root)
             if root is not None:
                 self.e.addnode(root.value.symbol.prop, root.value.atomic_number.value, root.value.mass_number.value)
-                self.get_path(root)
         
     def get_max_recursion_depth(self):
         return self.max_depth
 
 
+def check_element_exists(symbol, atomic_number, mass_number):
+    return get_index().check_element(symbol, atomic_number, mass_number)
+
 # Main
-tree = Tree()
+if __name__ == "__main__":
+    tree = Tree()
 
-def check_element_exists(symbol, atomic_number, mass_number):
-    try:
-        element = getattr(periodictable, symbol)
-        if element.number==atomic_number:
-            for i in element:
-                if str(i)[:3:]==str(mass_number):
-                    return 1
-            return 0
-        else:
-            return 0
-    except AttributeError:
-        return 0
-symbol=input("Enter the symbol:")
-atomic_number=int(input("Enter the atomic number of the element:"))
-mass_number=int(input("Enter the mass number of the element:"))
-if check_element_exists(symbol, atomic_number, mass_number):
-# Build the tree
-    tree.root = tree.build_tree(symbol,atomic_number,mass_number)
-    tree.e.addnode(symbol,atomic_number,mass_number)
+    symbol=input("Enter the symbol:")
+    atomic_number=int(input("Enter the atomic number of the element:"))
+    mass_number=int(input("Enter the mass number of the element:"))
+    if check_element_exists(symbol, atomic_number, mass_number):
+        # Build the tree
+        tree.root = tree.build_tree(symbol,atomic_number,mass_number)
+        tree.e.addnode(symbol,atomic_number,mass_number)
     
     
-    l=(tree.levelorder(tree.root))    
-    print("The tree looks like the following:")
-    for i in l:
-        if i is None:
-            print()
-        else:
-            print(i,end=" ")
+        l=(tree.levelorder(tree.root))    
+        print("The tree looks like the following:")
+        for i in l:
+            if i is None:
+                print()
+            else:
+                print(i,end=" ")
         
-    print()
-    print()
+        print()
+        print()
 
     
-    tree.get_path(tree.root)
-    print(tree.e)
+        tree.get_path(tree.root)
+        print(tree.e)
     
-else:
-    print("Invalid input")
+    else:
+        print("Invalid input")
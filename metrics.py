@@ -0,0 +1,132 @@
+"""
+Opt-in phase timers and counters for the decay pipeline.
+
+A Metrics object is handed to Tree(metrics=...) or NuclearGraph(metrics=...). The builder then replaces its own
+methods on that instance with timed, counted wrappers (instrument), so an object built without metrics runs the
+plain methods and pays nothing. The few per-node counters (nodes created, duplicate nuclides) are behind a single
+`if self.metrics is not None` test.
+
+Phases accumulate wall time and may nest: "build" includes the "lookup" and "binding_energy" time spent inside it.
+A phase already running is not timed again when it is re-entered.
+
+    metrics = Metrics()
+    tree = Tree(metrics=metrics)
+    ...
+    print(metrics.summary())          # build=12.41ms lookup=3.02ms ... | find_element=2310 ... | max_depth=26
+    metrics.to_json()                 # {"phases": {...}, "calls": {...}, "counters": {...}}
+"""
+import functools
+import inspect
+import json
+import time
+
+
+class Metrics:
+    def __init__(self):
+        self.phases = {}        # phase -> seconds
+        self.calls = {}         # instrumented method -> number of calls
+        self.counters = {}      # nodes_created, duplicates, max_depth, ...
+        self._active = set()    # phases currently running, so re-entry is not counted twice
+
+    def phase(self, name):
+        """
+        Context manager timing a block as the given phase, eg. with metrics.phase("render"): ...
+        """
+        return _Phase(self, name)
+
+    def add_time(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def maximum(self, name, value):
+        if value > self.counters.get(name, value - 1):
+            self.counters[name] = value
+
+    def instrument(self, obj, method, phase=None):
+        """
+        Replaces obj.method, on that instance only, with a wrapper that counts its calls and adds its wall time
+        to phase (if given). For a generator method only the time spent producing items is counted, not the time
+        the caller spends between them.
+        """
+        func = getattr(obj, method)
+        calls = self.calls
+        calls.setdefault(method, 0)
+        perf_counter = time.perf_counter
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                calls[method] += 1
+                items = func(*args, **kwargs)
+                while True:
+                    start = perf_counter()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    finally:
+                        if phase is not None:
+                            self.add_time(phase, perf_counter() - start)
+                    yield item
+
+            setattr(obj, method, generator_wrapper)
+            return
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            calls[method] += 1
+            if phase is None or phase in self._active:
+                return func(*args, **kwargs)
+            self._active.add(phase)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_time(phase, perf_counter() - start)
+                self._active.discard(phase)
+
+        setattr(obj, method, wrapper)
+
+    def to_dict(self):
+        return {"phases": dict(self.phases), "calls": dict(self.calls), "counters": dict(self.counters)}
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def summary(self):
+        """
+        One line: phase times in ms, then call counts, then counters.
+        """
+        parts = [" ".join(f"{name}={seconds * 1000:.2f}ms" for name, seconds in self.phases.items()),
+                 " ".join(f"{name}={count}" for name, count in self.calls.items()),
+                 " ".join(f"{name}={value}" for name, value in self.counters.items())]
+        return " | ".join(part for part in parts if part)
+
+    def reset(self):
+        for table in (self.phases, self.counters):
+            table.clear()
+        for name in self.calls:
+            self.calls[name] = 0
+
+
+class _Phase:
+    __slots__ = ("metrics", "name", "start", "nested")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.nested = self.name in self.metrics._active
+        if not self.nested:
+            self.metrics._active.add(self.name)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.nested:
+            self.metrics.add_time(self.name, time.perf_counter() - self.start)
+            self.metrics._active.discard(self.name)
+        return False
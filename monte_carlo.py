@@ -0,0 +1,96 @@
+import multiprocessing
+
+import numpy as np
+
+from bateman import DecayChain
+
+
+def _simulate_shard(args):
+    """
+    Follows n_atoms atoms of the root nuclide through the chain and returns the difference array of their
+    per-nuclide occupancy over the time grid (shape (len(times) + 1, n)). Module level so a process pool can
+    pickle it.
+    """
+    n_atoms, seed, times, decay_constants, cumulative, daughters = args
+    rng = np.random.default_rng(seed)
+    n_times, n_species = len(times), len(decay_constants)
+    occupancy = np.zeros((n_times + 1, n_species), dtype=np.int64)
+    end = times[-1]
+
+    species = np.zeros(n_atoms, dtype=np.int32)      # every atom starts as the root nuclide
+    entered = np.zeros(n_atoms)                        # time each atom entered its current nuclide
+    while len(species):
+        rates = decay_constants[species]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            left = entered + rng.exponential(1.0, len(species)) / rates    # stable nuclides never leave (inf)
+
+        # atom counts as its current nuclide for every grid time in [entered, left)
+        first = np.searchsorted(times, entered, side="left")
+        last = np.searchsorted(times, left, side="left")
+        occupancy += np.bincount(first * n_species + species, minlength=occupancy.size).reshape(occupancy.shape)
+        occupancy -= np.bincount(last * n_species + species, minlength=occupancy.size).reshape(occupancy.shape)
+
+        # only atoms that decay inside the grid need to be followed further
+        moving = left <= end
+        species, entered = species[moving], left[moving]
+        u = rng.random(len(species))
+        branch = (u[:, None] >= cumulative[species]).sum(axis=1)
+        species = daughters[species, np.minimum(branch, daughters.shape[1] - 1)]
+        inside = species >= 0                          # -1: no daughters (never reached, such nuclides do not decay)
+        species, entered = species[inside], entered[inside]
+    return occupancy
+
+
+class MonteCarloSimulation:
+    """
+    Stochastic counterpart of BatemanSolver: starts with N atoms of the root of a tree built by Tree.build_tree
+    or NuclearGraph.build_decay_tree and samples each atom's decay times (exponential in the nuclide's decay
+    constant) and branches over the decay network.
+
+    Atoms are NumPy arrays of nuclide indices and entry times rather than Python objects, and every step of the
+    loop advances all surviving atoms of one generation at once. Large runs are split into shards of shard_size
+    atoms with independent RNG streams spawned from one seed, so the result only depends on (seed, shard_size),
+    not on how many processes ran them. The shards' histograms are summed at the end.
+
+    half_lives and branching are passed on to DecayChain, whose fractions are used as they are: atoms that
+    leave the network are counted in its OUTSIDE sink, as in BatemanSolver.
+    """
+    def __init__(self, root, half_lives=None, branching=None):
+        self.chain = DecayChain(root, half_lives, branching)
+        self.labels = self.chain.labels
+        self.decay_constants = self.chain.decay_constants
+
+        # per parent: daughter indices and cumulative branching fractions, padded to the widest branching
+        n = len(self.chain)
+        width = max(1, int((self.chain.fractions > 0).sum(axis=0).max(initial=0)))
+        self.daughters = np.full((n, width), -1, dtype=np.int32)
+        self.cumulative = np.ones((n, width))
+        for parent in range(n):
+            children = np.nonzero(self.chain.fractions[:, parent])[0]
+            if len(children) == 0:
+                continue
+            fractions = self.chain.fractions[children, parent]
+            self.daughters[parent, :len(children)] = children
+            self.daughters[parent, len(children):] = children[-1]
+            self.cumulative[parent, :len(children)] = np.cumsum(fractions)     # adds up to 1 with the sink
+
+    def run(self, n_atoms, times, seed=0, processes=None, shard_size=1_000_000):
+        """
+        Returns an int array of shape (len(times), number of nuclides): how many of the n_atoms atoms are each
+        nuclide (columns in the order of self.labels) at every time in seconds. times must be sorted.
+        processes=None uses one process per CPU, processes=1 runs in this process.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        shards = [shard_size] * (n_atoms // shard_size)
+        if n_atoms % shard_size:
+            shards.append(n_atoms % shard_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(shards))
+        tasks = [(size, shard_seed, times, self.decay_constants, self.cumulative, self.daughters)
+                 for size, shard_seed in zip(shards, seeds)]
+
+        if processes == 1 or len(tasks) <= 1:
+            occupancy = sum(map(_simulate_shard, tasks))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                occupancy = sum(pool.imap_unordered(_simulate_shard, tasks))
+        return np.cumsum(occupancy, axis=0)[:len(times)]
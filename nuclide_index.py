@@ -0,0 +1,209 @@
+"""
+(Z, A) nuclide index shared by every lookup path, backed by a precompiled, memory-mapped data file.
+
+The first process to need the index walks periodictable once and writes
+    <cache dir>/nuclides-v<format>-periodictable-<version>.npy    one record per isotope: Z, A, atomic mass,
+                                                                  total binding energy and binding energy per nucleon
+    <cache dir>/symbols-v<format>-periodictable-<version>.npy     element symbol indexed by atomic number
+Every later process memory-maps those files read-only instead of importing periodictable, so short CLI runs and
+pool workers start quickly. Each process still builds its own dense arrays and dicts from the records (1-2 MB);
+the files are shared, the index is not. The periodictable version is part of the file name, so
+upgrading it makes the index rebuild itself; files of other versions are removed when that happens.
+
+The cache directory is $NUCLIDE_CACHE_DIR, or ~/.cache/nuclear_decay. If it cannot be written the index is built
+in memory as before.
+"""
+import glob
+import importlib.util
+import os
+import re
+
+import numpy as np
+
+CACHE_FORMAT = 1
+CACHE_DIRECTORY = os.environ.get("NUCLIDE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nuclear_decay"))
+RECORD_DTYPE = np.dtype([("z", "<i2"), ("a", "<i2"), ("mass", "<f8"), ("binding_energy", "<f8"),
+                         ("bepn", "<f8")])
+
+
+def periodictable_version():
+    """
+    Returns the installed periodictable version without importing it (importing it, or scanning the package
+    metadata with importlib.metadata, costs more than loading the whole cache).
+    """
+    spec = importlib.util.find_spec("periodictable")
+    if spec is not None and spec.origin:
+        with open(spec.origin, encoding="utf-8") as f:
+            match = re.search(r"""^__version__\s*=\s*['"]([^'"]+)['"]""", f.read(), re.MULTILINE)
+        if match:
+            return match.group(1)
+    import periodictable
+    return periodictable.__version__
+
+
+def cache_paths(directory=None):
+    """
+    Returns the (records, symbols) file paths for the installed periodictable version.
+    """
+    tag = f"v{CACHE_FORMAT}-periodictable-{periodictable_version()}"
+    directory = directory or CACHE_DIRECTORY
+    return os.path.join(directory, f"nuclides-{tag}.npy"), os.path.join(directory, f"symbols-{tag}.npy")
+
+
+def build_records():
+    """
+    Walks periodictable once and returns (records, symbols): a RECORD_DTYPE array of every known isotope sorted by
+    (Z, A) and an array of element symbols indexed by atomic number.
+    Binding energies use the same arithmetic as BindingEnergyService.
+    """
+    import periodictable
+    from binding_energy import PROTON_MASS, NEUTRON_MASS, AMU_TO_MEV
+
+    elements = [periodictable.elements[0]] + list(periodictable.elements)
+    symbols = np.array([""] * (max(element.number for element in elements) + 1), dtype="<U3")
+    rows = []
+    for element in elements:
+        symbols[element.number] = element.symbol
+        for isotope in element:
+            rows.append((element.number, isotope.isotope, isotope.mass))
+    rows.sort()
+
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    records["z"], records["a"], records["mass"] = zip(*rows)
+    z = records["z"].astype(np.int64)
+    a = records["a"].astype(np.int64)
+    total_mass_atom = (z * PROTON_MASS) + ((a - z) * NEUTRON_MASS)
+    records["binding_energy"] = (total_mass_atom - records["mass"]) * AMU_TO_MEV      # e = mc**2
+    records["bepn"] = np.nan
+    np.divide(records["binding_energy"], a, out=records["bepn"], where=a > 0)
+    return records, symbols
+
+
+def _save(path, array):
+    partial = f"{path}.{os.getpid()}.part"
+    np.save(partial, array)                       # np.save appends .npy to a name without it
+    os.replace(partial + ".npy", path)            # readers never see a half written file
+
+
+def load_records(directory=None, rebuild=False):
+    """
+    Returns (records, symbols) memory-mapped read-only from the cache files, writing them first if they are
+    missing, unreadable or rebuild is True. Falls back to in-memory arrays if the cache cannot be written.
+    """
+    records_path, symbols_path = cache_paths(directory)
+    if not rebuild:
+        try:
+            return np.load(records_path, mmap_mode="r"), np.load(symbols_path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+
+    records, symbols = build_records()
+    try:
+        os.makedirs(os.path.dirname(records_path), exist_ok=True)
+        _save(records_path, records)
+        _save(symbols_path, symbols)
+    except OSError:
+        return records, symbols
+    for stale in glob.glob(os.path.join(os.path.dirname(records_path), "*-v*-periodictable-*.npy")):
+        if stale not in (records_path, symbols_path) and ".part" not in stale:
+            try:
+                os.remove(stale)                  # written for another periodictable version or format
+            except OSError:
+                pass
+    return np.load(records_path, mmap_mode="r"), np.load(symbols_path, mmap_mode="r")
+
+
+class NuclideIndex:
+    """
+    Dense (Z, A) index over every isotope known to periodictable. It is built once and then shared by every
+    lookup path (Tree.find_element, NuclearGraph.find_element, check_element_exists) so that checking whether a
+    nuclide exists no longer formats a string for each isotope of the element.
+
+    Storage:
+        records -> the memory-mapped per-isotope records (see load_records)
+        exists  -> NumPy bool array of shape (max Z + 1, max A + 1), True if periodictable knows the isotope
+        mass    -> NumPy float array of the same shape holding the atomic mass in amu (0 if unknown)
+        bepn    -> binding energy per nucleon in MeV, same shape (NaN if unknown)
+        symbols -> list of element symbols indexed by atomic number
+    A plain dict keyed by (Z, A) mirrors the arrays for scalar lookups, which is faster than indexing NumPy
+    one element at a time. The arrays and dicts are private copies built from records in every process.
+    """
+    def __init__(self, records=None, symbols=None):
+        if records is None:
+            records, symbols = load_records()
+        self.records = records
+        z = records["z"].astype(np.intp)
+        a = records["a"].astype(np.intp)
+        self.max_z = len(symbols) - 1
+        self.max_a = int(a.max())
+
+        self.exists = np.zeros((self.max_z + 1, self.max_a + 1), dtype=bool)
+        self.mass = np.zeros((self.max_z + 1, self.max_a + 1), dtype=np.float64)
+        self.bepn = np.full((self.max_z + 1, self.max_a + 1), np.nan)
+        self.exists[z, a] = True
+        self.mass[z, a] = records["mass"]
+        self.bepn[z, a] = records["bepn"]
+
+        self.symbols = symbols.tolist()
+        self.numbers = {symbol: number for number, symbol in enumerate(self.symbols)}     # symbol -> atomic number
+        self.nuclides = {(zz, aa): (self.symbols[zz], mass)                               # (Z, A) -> (symbol, mass)
+                         for zz, aa, mass in zip(z.tolist(), a.tolist(), records["mass"].tolist())}
+        self.energies = dict(zip(zip(z.tolist(), a.tolist()),                            # (Z, A) -> (BE, BE/A)
+                                 zip(records["binding_energy"].tolist(), records["bepn"].tolist())))
+
+    def __len__(self):
+        return len(self.nuclides)
+
+    def __contains__(self, key):
+        return key in self.nuclides
+
+    def symbol(self, atomic_number):
+        """
+        Returns the element symbol for an atomic number, or None if it is outside the periodic table.
+        Time Complexity: O(1)
+        """
+        if 0 <= atomic_number <= self.max_z:
+            return self.symbols[atomic_number]
+        return None
+
+    def find_element(self, atomic_number, mass_number):
+        """
+        Returns the symbol of the nuclide (Z, A) if periodictable knows that isotope, otherwise None.
+        Time Complexity: O(1)
+        """
+        record = self.nuclides.get((atomic_number, mass_number))
+        if record is None:
+            return None
+        return record[0]
+
+    def atomic_mass(self, atomic_number, mass_number):
+        """
+        Returns the atomic mass of (Z, A) in amu. Unknown isotopes give 0, the same default the binding energy
+        calculations have always used.
+        Time Complexity: O(1)
+        """
+        record = self.nuclides.get((atomic_number, mass_number))
+        if record is None:
+            return 0
+        return record[1]
+
+    def check_element(self, symbol, atomic_number, mass_number):
+        """
+        Returns 1 if the symbol belongs to the given atomic number and the isotope exists, otherwise 0.
+        Time Complexity: O(1)
+        """
+        if self.numbers.get(symbol) != atomic_number:
+            return 0
+        return 1 if (atomic_number, mass_number) in self.nuclides else 0
+
+
+_index = None
+
+def get_index():
+    """
+    Returns the shared NuclideIndex, building it on first use.
+    """
+    global _index
+    if _index is None:
+        _index = NuclideIndex()
+    return _index
@@ -0,0 +1,257 @@
+"""
+Parallel decay tree builds.
+
+build_tree expands the whole tree in one process and creates a TreeNode for every node. build_tree_parallel
+expands the top of the tree as usual, down to split_depth, and hands every nuclide created below that depth to a
+process pool. Each worker builds the subtree (or sub-DAG) of its nuclide with an ordinary Tree and sends it back as
+flat NumPy arrays. The result is a decay_graph.DecayGraph assembled from those arrays: this process never creates
+the nodes below split_depth, it only concatenates arrays and sorts the edges into CSR order.
+
+The DecayGraph is exactly the network a fresh Tree with the same settings builds serially: same nuclides, same
+children in registry order, same node ids, so its levels, optimal paths and DOT text are those of build_tree.
+    tree   The serial build numbers nodes in depth first order, so a subtree's ids are one contiguous block: the
+           top of the tree is walked in build order and every subtree is given the next block as it is reached.
+    DAG    Which route reaches a shared nuclide first decides its id, so subtrees cannot be numbered on their own.
+           Workers return the decays of every nuclide they reached, and the depth first order of Tree is replayed
+           over those decays on (Z, A) keys, without building nodes.
+
+    with ProcessPoolExecutor(8, initializer=warm_worker) as pool:
+        graph = build_tree_parallel(Tree(), "Lr", 103, 251, split_depth=6, pool=pool)
+
+Each worker builds its own nuclide index and Q-value table from the memory-mapped cache files, once per process.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from decay_graph import DecayGraph
+from decay_modes import DEFAULT_MODES
+from decay_tree import Tree
+from nuclide_index import get_index
+from q_values import get_table
+
+DEFAULT_SPLIT_DEPTH = 6
+
+
+def warm_worker():
+    """
+    Loads the nuclide index and the default Q-value table once per worker process. Used as the pool initializer.
+    """
+    get_index()
+    get_table()
+
+
+def _registry_key(modes):
+    return tuple(mode.name for mode in modes), modes.build_order
+
+
+_registries = {_registry_key(DEFAULT_MODES): DEFAULT_MODES}   # worker side: key -> the registry used for it
+
+
+def _registry(modes):
+    # a registry arrives as a fresh copy with every task; keep one per set of modes so its Q-value table is reused
+    return _registries.setdefault(_registry_key(modes), modes)
+
+
+def _settings(tree, depth_limit):
+    return (depth_limit, tree.modes, tree.z_min, tree.z_max, tree.a_min, tree.a_max)
+
+
+def _worker_tree(settings):
+    depth_limit, modes, z_min, z_max, a_min, a_max = settings
+    return Tree(depth_limit=depth_limit, z_min=z_min, z_max=z_max, a_min=a_min, a_max=a_max,
+                modes=_registry(modes))
+
+
+def expand_subtree(task):
+    """
+    Worker: builds the subtree of one nuclide in tree mode. Returns (Z, A, parents, modes, max_depth), arrays in
+    node id order where parents[i] is the position of node i's parent (-1 for the subtree root) and modes[i] the
+    decay mode that produced it.
+    """
+    symbol, atomic_number, mass_number, depth, settings = task
+    tree = _worker_tree(settings)
+    root = tree.build_tree(symbol, atomic_number, mass_number, depth=depth - 1)
+    zs, as_, parents, modes = [], [], [], []
+    build_order = tree.modes.build_order
+    stack = [(root, -1, 0)]
+    while stack:                       # pre-order in build order is node id order
+        node, parent, mode = stack.pop()
+        position = len(zs)
+        zs.append(node.value.atomic_number.value)
+        as_.append(node.value.mass_number.value)
+        parents.append(parent)
+        modes.append(mode)
+        for child_mode in reversed(build_order):
+            child = node.child(child_mode)
+            if child is not None:
+                stack.append((child, position, child_mode))
+    return (np.array(zs, dtype=np.int16), np.array(as_, dtype=np.int16), np.array(parents, dtype=np.int32),
+            np.array(modes, dtype=np.uint8), tree.max_depth)
+
+
+def expand_decays(task):
+    """
+    Worker: builds the sub-DAG of one nuclide. Returns {(Z, A): [(mode, symbol, daughter Z, daughter A), ...]} for
+    every nuclide in it.
+    """
+    symbol, atomic_number, mass_number, depth, settings = task
+    tree = _worker_tree(settings)
+    tree.build_tree(symbol, atomic_number, mass_number, depth=depth - 1, dag=True)
+    return {key: _decays(node) for key, node in tree.nodes.items()}
+
+
+def _decays(node):
+    return [(mode, child.value.symbol.value, child.value.atomic_number.value, child.value.mass_number.value)
+            for mode, child in enumerate(node.children) if child is not None]
+
+
+def _top(tree, element, atomic_number, mass_number, depth, dag, split_depth):
+    # the serial part: a scratch tree with the same settings, expanded down to split_depth
+    top = Tree(depth_limit=tree.depth_limit, transitions=tree.transitions, z_min=tree.z_min, z_max=tree.z_max,
+               a_min=tree.a_min, a_max=tree.a_max, modes=tree.modes)
+    top.handoff, top.split_depth = [], split_depth
+    root = top.build_tree(element, atomic_number, mass_number, depth, dag)
+    return top, root
+
+
+def _graph(z, a, parents, edge_modes, targets, modes):
+    """
+    Returns the DecayGraph of nodes 0..n-1 (z, a in node id order, node 0 the root) and the edges
+    parents[i] -> targets[i] by edge_modes[i], sorted here into CSR order: by parent, then by mode.
+    """
+    n = len(z)
+    order = np.lexsort((edge_modes, parents))
+    parents, edge_modes, targets = parents[order], edge_modes[order], targets[order]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(parents, minlength=n), out=offsets[1:])
+    q = get_table(modes).q[edge_modes, z[parents], a[parents]]
+    return DecayGraph(z=z, a=a, bepn=get_index().bepn[z, a], node_id=np.arange(1, n + 1, dtype=np.int32),
+                      offsets=offsets, targets=targets.astype(np.int32), modes=edge_modes.astype(np.uint8), q=q,
+                      roots=np.zeros(1, dtype=np.int32), labels=np.array(modes.labels))
+
+
+def _tree_mode(tree, element, atomic_number, mass_number, depth, split_depth, pool, chunksize):
+    top, root = _top(tree, element, atomic_number, mass_number, depth, False, split_depth)
+    if root is None:
+        return None, 0
+    settings = _settings(tree, tree.depth_limit)
+    tasks = [(symbol, z, a, node_depth, settings) for _, symbol, z, a, node_depth, _ in top.handoff]
+    subtrees = dict(zip((id(frame[0]) for frame in top.handoff), pool.map(expand_subtree, tasks,
+                                                                          chunksize=chunksize)))
+
+    blocks = []                        # (Z, A, parents, modes) arrays, in node id order
+    top_nodes = ([], [], [], [])       # nodes of the top not yet in a block
+    count = 0
+    max_depth = top.max_depth
+    build_order = tree.modes.build_order
+    stack = [(root, -1, 0)]
+    while stack:                       # the serial order: pre-order of the top in build order
+        node, parent, mode = stack.pop()
+        subtree = subtrees.get(id(node))
+        if subtree is None:
+            for values, value in zip(top_nodes, (node.value.atomic_number.value, node.value.mass_number.value,
+                                                 parent, mode)):
+                values.append(value)
+            position = count
+            count += 1
+            for child_mode in reversed(build_order):
+                child = node.child(child_mode)
+                if child is not None:
+                    stack.append((child, position, child_mode))
+            continue
+        z, a, parents, modes, subtree_depth = subtree
+        if top_nodes[0]:
+            blocks.append(top_nodes)
+            top_nodes = ([], [], [], [])
+        parents = parents + count      # the subtree's nodes take the next block of ids
+        parents[0] = parent
+        modes = modes.copy()
+        modes[0] = mode
+        blocks.append((z, a, parents, modes))
+        count += len(z)
+        max_depth = max(max_depth, subtree_depth)
+    if top_nodes[0]:
+        blocks.append(top_nodes)
+
+    z, a, parents, modes = (np.concatenate([np.asarray(block[column]) for block in blocks]) for column in range(4))
+    z, a = z.astype(np.intp), a.astype(np.intp)
+    return _graph(z, a, parents[1:].astype(np.intp), modes[1:], np.arange(1, len(z)), tree.modes), max_depth
+
+
+def _dag_mode(tree, element, atomic_number, mass_number, depth, split_depth, pool, chunksize):
+    top, root = _top(tree, element, atomic_number, mass_number, depth, True, split_depth)
+    if root is None:
+        return None, 0
+    # depths inside a sub-DAG are not those of the serial build: the replay below checks the depth limit
+    settings = _settings(tree, float("inf"))
+    handed_off = {(z, a) for _, _, z, a, _, _ in top.handoff}
+    decays = {key: _decays(node) for key, node in top.nodes.items() if key not in handed_off}
+    tasks = [(symbol, z, a, node_depth, settings) for _, symbol, z, a, node_depth, _ in top.handoff]
+    for result in pool.map(expand_decays, tasks, chunksize=chunksize):
+        decays.update(result)
+    daughters = {(key, mode): (symbol, child_z, child_a)
+                 for key, children in decays.items() for mode, symbol, child_z, child_a in children}
+
+    # replay of Tree._expand with dag=True: a nuclide gets the next id when it is first reached
+    key = (atomic_number, mass_number)
+    positions = {key: 0}
+    zs, as_ = [atomic_number], [mass_number]
+    parents, edge_modes, targets = [], [], []
+    max_depth = depth + 1
+    build_order = tree.modes.build_order
+    stack = [[key, depth + 1, 0]]
+    while stack:
+        frame = stack[-1]
+        key, node_depth, step = frame
+        if step == len(build_order):
+            stack.pop()
+            continue
+        frame[2] += 1
+        mode = build_order[step]
+        daughter = daughters.get((key, mode))
+        if daughter is None:
+            continue
+        symbol, child_z, child_a = daughter
+        child = positions.get((child_z, child_a))
+        if child is None:
+            if node_depth + 1 > tree.depth_limit:
+                raise RuntimeError(f"Decay chain of {symbol}-{child_a} exceeds the depth limit of {tree.depth_limit}")
+            child = positions[(child_z, child_a)] = len(zs)
+            zs.append(child_z)
+            as_.append(child_a)
+            max_depth = max(max_depth, node_depth + 1)
+            stack.append([(child_z, child_a), node_depth + 1, 0])
+        parents.append(positions[key])
+        edge_modes.append(mode)
+        targets.append(child)
+
+    return _graph(np.array(zs, dtype=np.intp), np.array(as_, dtype=np.intp), np.array(parents, dtype=np.intp),
+                  np.array(edge_modes, dtype=np.intp), np.array(targets, dtype=np.intp), tree.modes), max_depth
+
+
+def build_tree_parallel(tree, element, atomic_number, mass_number, depth=0, dag=False,
+                        split_depth=DEFAULT_SPLIT_DEPTH, processes=None, pool=None, chunksize=1):
+    """
+    Builds the tree (or DAG) of a nuclide, expanding everything below split_depth in worker processes, and returns
+    it as a DecayGraph (None if the nuclide is outside the studied region). tree supplies the settings (decay
+    modes, studied region, depth limit, TransitionTable) and is not modified; node ids are those a fresh Tree with
+    the same settings would give. With metrics on tree, the build phase, nodes_created and max_depth are recorded.
+    pool is an existing executor to use (eg. one created with initializer=warm_worker and kept for many builds);
+    otherwise a ProcessPoolExecutor of processes workers is created for this build.
+    Raises RuntimeError like build_tree if a chain is too deep.
+    """
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=processes, initializer=warm_worker) as pool:
+            return build_tree_parallel(tree, element, atomic_number, mass_number, depth, dag, split_depth,
+                                       pool=pool, chunksize=chunksize)
+
+    mode = _dag_mode if dag else _tree_mode
+    if tree.metrics is None:
+        return mode(tree, element, atomic_number, mass_number, depth, split_depth, pool, chunksize)[0]
+    with tree.metrics.phase("build"):
+        graph, max_depth = mode(tree, element, atomic_number, mass_number, depth, split_depth, pool, chunksize)
+    if graph is not None:
+        tree.metrics.count("nodes_created", len(graph))
+        tree.metrics.maximum("max_depth", max_depth)
+    return graph
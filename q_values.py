@@ -0,0 +1,94 @@
+"""
+Decay energetics of the whole nuclide chart, computed once.
+
+A QValueTable holds, for every mode of a DecayModeRegistry and every known parent nuclide (Z, A), the Q value of
+the decay and whether the tree allows it, as dense arrays indexed [mode, Z, A]:
+    q        float64   Q in MeV from atomic masses, NaN where the daughter is unknown
+    allowed  bool      the daughter is known and the mode's filter accepts it (by default: binding energy per
+                       nucleon rises, the rule compare_calculate_mass_defect implements)
+Both come from one NumPy pass per mode over the mass and binding energy arrays of the nuclide index, so deciding
+an edge while building a tree, or weighting it for a path search, is a single array lookup.
+
+Q = (M(parent) - M(daughter) - M(emitted nuclide) - extra mass) * 931.5, with atomic masses; the emitted nuclide and
+the extra mass (two electron masses for beta plus) come from the DecayMode.
+"""
+import numpy as np
+
+from binding_energy import AMU_TO_MEV
+from decay_modes import DEFAULT_MODES
+from nuclide_index import get_index
+
+
+class QValueTable:
+    """
+    Time Complexity: O(modes * known nuclides) to build, O(1) per lookup
+    """
+    def __init__(self, modes=None):
+        index = get_index()
+        self.modes = DEFAULT_MODES if modes is None else modes
+        shape = (len(self.modes),) + index.exists.shape
+        self.q = np.full(shape, np.nan)
+        self.allowed = np.zeros(shape, dtype=bool)
+
+        z, a = np.nonzero(index.exists)
+        for mode, decay in enumerate(self.modes):
+            cz, ca = z + decay.dz, a + decay.da
+            keep = (cz >= 0) & (cz <= index.max_z) & (ca > 0) & (ca <= index.max_a)
+            keep[keep] = index.exists[cz[keep], ca[keep]]
+            pz, pa, cz, ca = z[keep], a[keep], cz[keep], ca[keep]
+
+            delta = index.mass[pz, pa] - index.mass[cz, ca]
+            if decay.emitted is not None:
+                delta -= index.mass[decay.emitted]
+            if decay.extra_mass:
+                delta -= decay.extra_mass
+            self.q[mode, pz, pa] = delta * AMU_TO_MEV
+
+            if decay.allowed is None:
+                self.allowed[mode, pz, pa] = index.bepn[pz, pa] < index.bepn[cz, ca]
+            else:
+                self.allowed[mode, pz, pa] = decay.allowed(pz, pa, cz, ca)
+
+        # modes with the same (ΔZ, ΔA) must not both allow a parent, or it would get two children with one daughter
+        shifts = {}
+        for mode, decay in enumerate(self.modes):
+            other = shifts.setdefault((decay.dz, decay.da), mode)
+            if other != mode and np.any(self.allowed[other] & self.allowed[mode]):
+                raise ValueError(f"Decay modes {self.modes[other].name!r} and {decay.name!r} both allow the same "
+                                 "decays; give them disjoint filters")
+
+        # (Z, A, mode) of every allowed decay, for scalar lookups without NumPy indexing overhead
+        modes, z, a = np.nonzero(self.allowed)
+        self._allowed = set(zip(z.tolist(), a.tolist(), modes.tolist()))
+
+    def q_value(self, atomic_number, mass_number, mode):
+        """
+        Returns the Q value in MeV of decaying (Z, A) by the mode (a registry index), NaN if there is no such decay.
+        Time Complexity: O(1)
+        """
+        if not self._inside(atomic_number, mass_number):
+            return float("nan")
+        return float(self.q[mode, atomic_number, mass_number])
+
+    def is_allowed(self, atomic_number, mass_number, mode):
+        """
+        Returns True if (Z, A) decays by the mode to a known daughter that the mode's filter accepts.
+        Time Complexity: O(1)
+        """
+        return (atomic_number, mass_number, mode) in self._allowed
+
+    def _inside(self, atomic_number, mass_number):
+        return 0 <= atomic_number < self.q.shape[1] and 0 <= mass_number < self.q.shape[2]
+
+
+_tables = {}
+
+def get_table(modes=None):
+    """
+    Returns the shared QValueTable of a registry (default: the standard modes), building it on first use.
+    Registries are immutable, so one table per registry is enough.
+    """
+    modes = DEFAULT_MODES if modes is None else modes
+    if modes not in _tables:
+        _tables[modes] = QValueTable(modes)
+    return _tables[modes]
@@ -0,0 +1,138 @@
+"""
+Content-addressed cache for rendered decay trees.
+
+Graphviz layout is by far the slowest stage of a run, and the same root nuclide with the same options always gives
+the same DOT source. RenderCache keys every artifact by a SHA-256 of what produced it (the DOT source and output
+format for Graphviz renders, the path contents for PDF reports) and keeps the files in a local cache directory.
+A repeated request is copied out of the cache instead of being rendered again.
+
+The directory is bounded by max_bytes. Hits refresh a file's modification time and the oldest files are evicted
+first, so it behaves as a size-based LRU. enabled=False bypasses it completely.
+"""
+import hashlib
+import os
+import shutil
+
+DEFAULT_DIRECTORY = os.environ.get("RENDER_CACHE_DIR", ".render_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class RenderCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        """
+        Returns the hex digest identifying an artifact built from parts (strings, numbers or bytes).
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key, extension):
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def fetch(self, key, extension, target, build):
+        """
+        Makes target hold the artifact for key. On a hit the cached file is copied to target; on a miss
+        build(target) is called to create it and the result is stored. Returns (target, hit).
+        Time Complexity: O(size of the file) on a hit, plus one directory scan for eviction on a miss
+        """
+        if self.enabled:
+            cached = self.path(key, extension)
+            try:
+                os.utime(cached)                       # most recently used
+                shutil.copyfile(cached, target)
+                self.hits += 1
+                return target, True
+            except FileNotFoundError:
+                pass                                   # not cached, or evicted by another process meanwhile
+
+        self.misses += 1
+        build(target)
+        if self.enabled:
+            self.store_file(key, extension, target)
+        return target, False
+
+    def store_file(self, key, extension, source):
+        """
+        Copies source into the cache under key, then evicts the least recently used files over max_bytes.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        cached = self.path(key, extension)
+        partial = self._partial(cached)
+        shutil.copyfile(source, partial)
+        os.replace(partial, cached)                    # readers never see a half written file
+        self.evict()
+        return cached
+
+    def store_text(self, key, extension, text):
+        os.makedirs(self.directory, exist_ok=True)
+        cached = self.path(key, extension)
+        partial = self._partial(cached)
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(partial, cached)
+        self.evict()
+        return cached
+
+    @staticmethod
+    def _partial(cached):
+        # one temporary file per writing process, so concurrent writers of the same key never share it
+        return f"{cached}.{os.getpid()}.part"
+
+    def render(self, dot, filename, format="png"):
+        """
+        Cached replacement for dot.render(filename, format=format, cleanup=True) on a graphviz Digraph.
+        The DOT source is stored next to the rendered file. Returns the path of the rendered file.
+        """
+        key = self.key(dot.source, format, dot.engine)
+        target = f"{filename}.{format}"
+
+        def build(path):
+            dot.render(filename, format=format, cleanup=True)
+            if self.enabled:
+                self.store_text(key, "dot", dot.source)
+
+        return self.fetch(key, format, target, build)[0]
+
+    def evict(self):
+        """
+        Removes the least recently used files until the cache holds at most max_bytes.
+        Time Complexity: O(f log f) for f cached files
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue                       # removed by another process since the scan
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass                                   # already evicted by another process
+            total -= size
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "directory": self.directory, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.hits = self.misses = 0
@@ -0,0 +1,253 @@
+"""
+Multi-page PDF reports of many decay chains.
+
+Tree.generate_pdf writes one document per path. For a batch of roots a ReportWriter streams every chain into one
+document instead: each chain is a heading and a table (step, nuclide, Z, A, binding energy per nucleon, its gain,
+decay mode and Q value), optionally followed by the rendered decay graph, and the report ends with a summary page
+of all chains. The document, its fonts and its page template are set up once and reused for every chain.
+
+fpdf keeps a document in memory until it is written, so memory grows with the pages of the current file. With
+chains_per_file=N the report is split into decay_report_001.pdf, decay_report_002.pdf, ... and each file is
+written out and released once it is full; the summary page goes into the last file.
+
+Usage:
+    python report.py roots.txt [--out decay_report.pdf] [--chains-per-file N] [--images] [--dag]
+                               [--objective final_be|fewest_steps|max_q]
+where roots.txt has one "symbol Z A" root per line, as for batch.py.
+"""
+import argparse
+import os
+import struct
+import tempfile
+
+from batch import read_roots
+from decay_tree import Tree, check_element_exists
+from render_cache import RenderCache
+from transition_table import TransitionTable
+
+# (heading, width in mm, alignment) of the chain table columns; the widths add up to the 190 mm text width of A4
+COLUMNS = (("Step", 12, "C"), ("Nuclide", 24, "L"), ("Z", 12, "C"), ("A", 14, "C"), ("BE/A (MeV)", 28, "R"),
+           ("Gain (MeV)", 26, "R"), ("Decay", 50, "L"), ("Q (MeV)", 24, "R"))
+SUMMARY_COLUMNS = (("Root", 30, "L"), ("Steps", 16, "C"), ("End", 30, "L"), ("BE/A gain (MeV)", 38, "R"),
+                   ("Total Q (MeV)", 34, "R"), ("Nodes", 22, "R"), ("File", 20, "C"))
+ROW_HEIGHT = 6
+
+
+def chain_rows(tree, path):
+    """
+    Returns the table rows of a path found on tree, one per nuclide:
+        (step, symbol, Z, A, BE per nucleon, gain over the previous step, decay mode title, Q value)
+    The first row (the root) has no gain, decay or Q.
+    """
+    rows = []
+    for step, node in enumerate(path):
+        value = node.value
+        if step == 0:
+            rows.append((0, value.symbol.value, value.atomic_number.value, value.mass_number.value,
+                         value.binding_energy.value, None, "", None))
+            continue
+        parent = path[step - 1].value
+        mode = next(mode for mode, child in enumerate(path[step - 1].children) if child is node)
+        rows.append((step, value.symbol.value, value.atomic_number.value, value.mass_number.value,
+                     value.binding_energy.value, value.binding_energy.value - parent.binding_energy.value,
+                     tree.modes[mode].title,
+                     tree.qvalues.q_value(parent.atomic_number.value, parent.mass_number.value, mode)))
+    return rows
+
+
+def _png_size(filepath):
+    # (width, height) in pixels from the IHDR chunk
+    with open(filepath, "rb") as f:
+        return struct.unpack(">II", f.read(24)[16:24])
+
+
+def _number(value, digits):
+    return "" if value is None else f"{value:.{digits}f}"
+
+
+class ReportWriter:
+    """
+    Writes chains into a multi-page PDF (or a numbered set of them), see the module docstring.
+    images=True embeds each chain's decay graph rendered by Graphviz (through render_cache, so repeated roots are
+    not laid out again). Use it as a context manager, or call close() to write the summary and the last file.
+    Time Complexity: O(path length) per chain, plus the render when images is set
+    """
+    def __init__(self, filepath="decay_report.pdf", chains_per_file=None, images=False, cache=None,
+                 title="Decay chain report"):
+        self.filepath = filepath
+        self.chains_per_file = chains_per_file
+        self.images = images
+        self.cache = cache if cache is not None else RenderCache()
+        self.title = title
+        self.files = []               # files written so far
+        self.summary = []             # one summary row per chain, kept for the summary page
+        self._pdf = None              # document being filled
+        self._chains_in_file = 0
+        self._image_directory = tempfile.TemporaryDirectory() if images else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _current_path(self):
+        if self.chains_per_file is None:
+            return self.filepath
+        stem, extension = os.path.splitext(self.filepath)
+        return f"{stem}_{len(self.files) + 1:03d}{extension or '.pdf'}"
+
+    def _document(self):
+        # one document per output file; fonts and the page template are set up here only
+        if self._pdf is not None:
+            return self._pdf
+        from fpdf import FPDF              # imported on demand, PDF export is optional
+
+        title = self.title
+
+        class ReportPDF(FPDF):
+            def header(self):
+                self.set_font("Arial", "B", 9)
+                self.cell(0, 6, title, border="B", ln=1, align="L")
+                self.ln(2)
+
+            def footer(self):
+                self.set_y(-15)
+                self.set_font("Arial", "", 8)
+                self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
+
+        pdf = ReportPDF(format="A4")
+        pdf.alias_nb_pages()
+        pdf.set_auto_page_break(True, margin=20)
+        pdf.set_fill_color(220, 220, 220)
+        pdf.add_page()
+        self._pdf = pdf
+        return pdf
+
+    def _room(self, height):
+        # starts a new page unless height mm still fit above the bottom margin
+        pdf = self._pdf
+        if pdf.get_y() + height > pdf.page_break_trigger:
+            pdf.add_page()
+
+    def _table_header(self, columns):
+        pdf = self._pdf
+        pdf.set_font("Arial", "B", 9)
+        for heading, width, _ in columns:
+            pdf.cell(width, ROW_HEIGHT, heading, border=1, align="C", fill=1)
+        pdf.ln()
+        pdf.set_font("Arial", "", 9)
+
+    def _table(self, columns, rows):
+        # rows of strings; the header is repeated at the top of every page the table runs onto
+        pdf = self._pdf
+        self._table_header(columns)
+        for row in rows:
+            if pdf.get_y() + ROW_HEIGHT > pdf.page_break_trigger:
+                pdf.add_page()
+                self._table_header(columns)
+            for (_, width, align), text in zip(columns, row):
+                pdf.cell(width, ROW_HEIGHT, text, border=1, align=align)
+            pdf.ln()
+
+    def add_chain(self, tree, root, path):
+        """
+        Adds the chain of one root: path is the list of nodes returned by tree.find_optimal_path(root).
+        """
+        if self.chains_per_file is not None and self._chains_in_file >= self.chains_per_file:
+            self._write()                      # the current file is full
+        pdf = self._document()
+        rows = chain_rows(tree, path)
+        first = rows[0]
+        self._room(10 + 3 * ROW_HEIGHT)        # keep the heading together with the start of its table
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, f"{first[1]}-{first[3]} (Z={first[2]}): {len(path) - 1} decays, {tree.node_counter} nodes",
+                 ln=1)
+        self._table(COLUMNS, [(str(step), symbol, str(z), str(a), _number(bepn, 4), _number(gain, 4), mode,
+                               _number(q, 3)) for step, symbol, z, a, bepn, gain, mode, q in rows])
+        if self.images:
+            self._image(tree, root)
+        pdf.ln(6)
+
+        last = rows[-1]
+        self.summary.append((f"{first[1]}-{first[3]}", str(len(path) - 1), f"{last[1]}-{last[3]}",
+                             _number(last[4] - first[4], 4), _number(sum(row[7] for row in rows[1:]), 3),
+                             str(tree.node_counter), str(len(self.files) + 1)))
+        self._chains_in_file += 1
+
+    def _image(self, tree, root):
+        # the decay graph as a PNG, scaled to the text width and to at most half a page
+        pdf = self._pdf
+        value = root.value
+        filename = os.path.join(self._image_directory.name,
+                                f"{value.symbol.value}_{value.mass_number.value}_{len(self.summary)}")
+        png = self.cache.render(tree.visualize_tree(root), filename, format="png")
+        width, height = _png_size(png)
+        scale = min(190 / width, 130 / height)
+        self._room(height * scale + 4)
+        pdf.ln(2)
+        pdf.image(png, x=10, w=width * scale, h=height * scale)
+        os.remove(png)                         # fpdf has read it; only the render cache keeps a copy
+
+    def _summary_page(self):
+        pdf = self._document()
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, f"Summary: {len(self.summary)} chains", ln=1)
+        columns = SUMMARY_COLUMNS if self.chains_per_file is not None else SUMMARY_COLUMNS[:-1]
+        self._table(columns, [row[:len(columns)] for row in self.summary])
+
+    def _write(self):
+        filepath = self._current_path()
+        self._pdf.output(filepath)
+        self.files.append(filepath)
+        self._pdf = None                       # release the pages before the next file is started
+        self._chains_in_file = 0
+
+    def close(self):
+        """
+        Adds the summary page, writes the last file and returns the list of files written.
+        """
+        if self.summary:
+            self._summary_page()
+            self._write()
+        if self._image_directory is not None:
+            self._image_directory.cleanup()
+            self._image_directory = None
+        return self.files
+
+
+def write_report(roots, filepath="decay_report.pdf", objective="final_be", dag=False, images=False,
+                 chains_per_file=None):
+    """
+    Builds every (symbol, Z, A) root, finds its optimal path and streams it into a report. Each tree is dropped
+    as soon as its chain is written. Invalid roots are skipped. Returns the list of files written.
+    """
+    transitions = TransitionTable()          # every daughter read from one table, shared by all roots
+    with ReportWriter(filepath, chains_per_file, images) as writer:
+        for symbol, atomic_number, mass_number in roots:
+            if not check_element_exists(symbol, atomic_number, mass_number):
+                continue
+            tree = Tree(transitions=transitions)
+            root = tree.build_tree(symbol, atomic_number, mass_number, dag=dag)
+            writer.add_chain(tree, root, tree.find_optimal_path(root, objective))
+    return writer.files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF report of the optimal decay chains of many nuclides")
+    parser.add_argument("roots", help="file with one 'symbol Z A' root per line")
+    parser.add_argument("--out", default="decay_report.pdf", help="report file (numbered when split)")
+    parser.add_argument("--chains-per-file", type=int, help="split the report into files of this many chains")
+    parser.add_argument("--images", action="store_true", help="embed each decay graph (needs Graphviz)")
+    parser.add_argument("--dag", action="store_true", help="share repeated nuclides instead of duplicating subtrees")
+    parser.add_argument("--objective", default="final_be", choices=["final_be", "fewest_steps", "max_q"])
+    args = parser.parse_args(argv)
+
+    for filepath in write_report(read_roots(args.roots), args.out, args.objective, args.dag, args.images,
+                                 args.chains_per_file):
+        print(filepath)
+
+
+if __name__ == "__main__":
+    main()
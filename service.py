@@ -0,0 +1,304 @@
+"""
+Long-running query service for decay trees.
+
+Starting a Python process per question (main_2.py) pays for the interpreter, periodictable and the nuclide index
+every time. This module keeps them loaded in a small asyncio HTTP server instead:
+
+    python service.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers N] [--cache-size 256]
+
+Every endpoint is a GET taking the root as symbol=U&z=92&a=238 plus the options listed:
+    /tree        nodes and edges of the tree as JSON                  dag, modes
+    /levelorder  levels of the tree as JSON                           dag, modes, max_levels, max_nodes
+    /path        optimal path as JSON                                 dag, modes, objective
+    /dot         DOT text, optimal path highlighted                   dag, modes, objective, q_labels
+    /png         the same graph rendered by Graphviz                  dag, modes, objective, q_labels
+    /stats       result cache counters (no root)
+modes is a comma separated list of extra decay modes (see decay_modes.py), dag and q_labels are 1 or 0.
+
+Responses are kept in an LRU cache keyed by endpoint, root and the options that endpoint uses, so a repeated
+question is answered without any work, and identical questions arriving together share one computation. Builds
+and renders run in a process pool, so the event loop keeps accepting and answering requests meanwhile. The server
+binds to 127.0.0.1 (or a Unix socket) unless told otherwise.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from decay_modes import DecayModeRegistry
+from decay_tree import Tree, check_element_exists
+from parallel_build import warm_worker
+from render_cache import RenderCache
+
+ENDPOINTS = {                      # endpoint -> options it depends on, which are also its cache key
+    "/tree": ("dag", "modes"),
+    "/levelorder": ("dag", "modes", "max_levels", "max_nodes"),
+    "/path": ("dag", "modes", "objective"),
+    "/dot": ("dag", "modes", "objective", "q_labels"),
+    "/png": ("dag", "modes", "objective", "q_labels"),
+}
+OBJECTIVES = ("final_be", "fewest_steps", "max_q")
+TREE_CACHE_SIZE = 8                # built trees kept per worker process
+MAX_REQUEST_LINE = 8192
+
+
+class QueryError(Exception):
+    """
+    A request the service cannot answer; status is the HTTP status code to send back.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _flag(value):
+    if value not in ("0", "1", "true", "false"):
+        raise QueryError(400, f"Expected 1 or 0, got {value!r}")
+    return value in ("1", "true")
+
+
+def _count(value):
+    if not value.isdigit():
+        raise QueryError(400, f"Expected a non-negative integer, got {value!r}")
+    return int(value)
+
+
+def parse_query(endpoint, query):
+    """
+    Validates the query string of an endpoint and returns its options as a hashable tuple of (name, value)
+    pairs, root first. Raises QueryError (400 bad option, 404 unknown endpoint or nuclide).
+    """
+    if endpoint not in ENDPOINTS:
+        raise QueryError(404, f"Unknown endpoint {endpoint}, expected one of {', '.join(ENDPOINTS)}")
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    try:
+        symbol, atomic_number, mass_number = params["symbol"], int(params["z"]), int(params["a"])
+    except (KeyError, ValueError):
+        raise QueryError(400, "symbol, z and a are required, eg. ?symbol=U&z=92&a=238")
+    if not check_element_exists(symbol, atomic_number, mass_number):
+        raise QueryError(404, f"Unknown nuclide {symbol}-{mass_number} (Z={atomic_number})")
+
+    options = {"dag": _flag(params.get("dag", "0")), "modes": params.get("modes", ""),
+               "objective": params.get("objective", "final_be"), "q_labels": _flag(params.get("q_labels", "0")),
+               "max_levels": None, "max_nodes": None}
+    for name in ("max_levels", "max_nodes"):
+        if name in params:
+            options[name] = _count(params[name])
+    if options["objective"] not in OBJECTIVES:
+        raise QueryError(400, f"Unknown objective {options['objective']!r}, expected one of {', '.join(OBJECTIVES)}")
+    if options["modes"]:
+        try:
+            DecayModeRegistry.with_modes(*options["modes"].split(","))
+        except ValueError as error:
+            raise QueryError(400, str(error))
+    return (("symbol", symbol), ("z", atomic_number), ("a", mass_number)) + tuple(
+        (name, options[name]) for name in ENDPOINTS[endpoint])
+
+
+# Worker side. compute runs in the executor; it keeps the last few built trees of its process so the endpoints of
+# one root share a build. The lock makes it safe in a thread pool too, as path searches mutate the tree.
+
+_trees = OrderedDict()             # (symbol, Z, A, dag, modes) -> Tree with root built
+_lock = threading.Lock()
+
+
+def _tree(symbol, atomic_number, mass_number, dag, modes):
+    key = (symbol, atomic_number, mass_number, dag, modes)
+    tree = _trees.get(key)
+    if tree is not None:
+        _trees.move_to_end(key)
+        return tree
+    tree = Tree(modes=DecayModeRegistry.with_modes(*modes.split(",")) if modes else None)
+    tree.root = tree.build_tree(symbol, atomic_number, mass_number, dag=dag)
+    _trees[key] = tree
+    if len(_trees) > TREE_CACHE_SIZE:
+        _trees.popitem(last=False)
+    return tree
+
+
+def _optimal_path(tree, objective):
+    tree.reset_path()              # a fresh search on a cached tree: drop the bookkeeping of the previous one
+    return tree.find_optimal_path(tree.root, objective)
+
+
+def _nuclide(node):
+    value = node.value
+    return [value.symbol.value, value.atomic_number.value, value.mass_number.value, value.binding_energy.value]
+
+
+def compute(endpoint, options):
+    """
+    Answers one validated query (see parse_query). Returns (content type, body bytes).
+    """
+    options = dict(options)
+    with _lock:
+        tree = _tree(options["symbol"], options["z"], options["a"], options["dag"], options["modes"])
+        result = {"symbol": options["symbol"], "atomic_number": options["z"], "mass_number": options["a"]}
+
+        if endpoint == "/tree":
+            nodes, edges = [], []
+            for _, node in tree.iter_levelorder(tree.root):
+                nodes.append([node.node_id] + _nuclide(node))
+                edges.extend([node.node_id, child.node_id, tree.modes[mode].label]
+                             for mode, child in enumerate(node.children) if child is not None)
+            result.update(max_depth=tree.max_depth, nodes=nodes, edges=edges)
+        elif endpoint == "/levelorder":
+            result["levels"] = [[[value.symbol.value, value.atomic_number.value, value.mass_number.value,
+                                  value.binding_energy.value] for value in level]
+                                for level in tree.iter_levels(tree.root, options["max_levels"], options["max_nodes"])]
+        elif endpoint == "/path":
+            result["path"] = [_nuclide(node) for node in _optimal_path(tree, options["objective"])]
+        else:
+            _optimal_path(tree, options["objective"])
+            tree.q_labels = options["q_labels"]
+            if endpoint == "/dot":
+                with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+                    tree.write_dot(tree.root, f)
+                    f.seek(0)
+                    return "text/vnd.graphviz; charset=utf-8", f.read().encode("utf-8")
+            with tempfile.TemporaryDirectory() as directory:
+                try:
+                    png = RenderCache().render(tree.visualize_tree(tree.root), os.path.join(directory, "tree"), "png")
+                except Exception as error:     # graphviz errors lose their message when pickled back to the server
+                    raise RuntimeError(f"{type(error).__name__}: {error}") from None
+                with open(png, "rb") as f:
+                    return "image/png", f.read()
+    return "application/json", json.dumps(result).encode("utf-8")
+
+
+class QueryService:
+    """
+    The asyncio side: HTTP parsing, the response cache and the executor.
+    executor defaults to a ProcessPoolExecutor with workers processes (default: one per CPU). Its workers are
+    started by a fork server (or spawned), never forked from the server itself, since a forked worker would inherit
+    the open client connections and keep them from closing.
+    Time Complexity: O(1) per cached response
+    """
+    def __init__(self, workers=None, cache_size=256, executor=None):
+        if executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=warm_worker)
+        self.executor = executor
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()            # (endpoint, options) -> (content type, body)
+        self._pending = {}                     # (endpoint, options) -> Future of a computation in progress
+
+    async def query(self, endpoint, options):
+        """
+        Returns (content type, body) for a validated query, from the cache when possible.
+        """
+        key = (endpoint, options)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+        if key in self._pending:               # the same question is already being computed
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, compute, endpoint, options)
+        self._pending[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            del self._pending[key]
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)    # evict the least recently used response
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.cache_size,
+                "pending": len(self._pending)}
+
+    async def respond(self, method, target):
+        """
+        Returns (status, content type, body) for one request.
+        """
+        if method != "GET":
+            return 405, "text/plain", b"Only GET is supported\n"
+        url = urlsplit(target)
+        if url.path == "/stats":
+            return 200, "application/json", json.dumps(self.stats()).encode("utf-8")
+        try:
+            return (200,) + await self.query(url.path, parse_query(url.path, url.query))
+        except QueryError as error:
+            return error.status, "text/plain", f"{error}\n".encode("utf-8")
+        except Exception as error:             # a failed build or render, eg. Graphviz not installed
+            return 500, "text/plain", f"{error}\n".encode("utf-8")
+
+    async def handle(self, reader, writer):
+        # one request per connection: read the request line and headers, answer, close
+        try:
+            request_line = await reader.readline()
+            if len(request_line) > MAX_REQUEST_LINE:
+                status, content_type, body = 414, "text/plain", b"Request line too long\n"
+            else:
+                while (await reader.readline()).strip():
+                    pass                       # headers are not used
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, content_type, body = 400, "text/plain", b"Malformed request line\n"
+                else:
+                    status, content_type, body = await self.respond(parts[0], parts[1])
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                      414: "URI Too Long", 500: "Internal Server Error"}[status]
+            writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+        except (ConnectionError, ValueError):  # client went away, or a line over the stream limit
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix=None):
+        """
+        Starts listening (on the Unix socket path unix if given) and returns the asyncio server.
+        """
+        if unix is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix=None):
+    server = await service.start(host, port, unix)
+    addresses = [unix] if unix is not None else [socket.getsockname() for socket in server.sockets]
+    print(f"serving decay trees on {', '.join(map(str, addresses))}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve decay tree queries over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache-size", type=int, default=256, help="responses kept in the LRU cache")
+    args = parser.parse_args(argv)
+
+    service = QueryService(args.workers, args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from bateman import HALF_LIVES, DAY, OUTSIDE, YEAR, BatemanSolver, DecayChain, missing_half_lives
+from decay_modes import ALPHA
+from decay_tree import Tree, TreeNode
+
+
+def two_member_chain():
+    # Ra-226 -> Rn-222, built by hand so the chain has exactly two nuclides
+    root = TreeNode("Ra", 88, 226, 1)
+    root.set_child(ALPHA, TreeNode("Rn", 86, 222, 2))
+    return root
+
+
+def test_two_member_chain_matches_analytic_solution():
+    solver = BatemanSolver(two_member_chain(), initial_atoms=1e6)
+    assert solver.labels == ["Ra-226", "Rn-222", OUTSIDE]
+    l1, l2 = np.log(2) / HALF_LIVES[(88, 226)], np.log(2) / HALF_LIVES[(86, 222)]
+    times = np.array([0.0, 1e5, 1e6, 1e9, 1e11])
+
+    parent = 1e6 * np.exp(-l1 * times)
+    daughter = 1e6 * l1 / (l2 - l1) * (np.exp(-l1 * times) - np.exp(-l2 * times))
+    expected = np.column_stack((parent, daughter, 1e6 - parent - daughter))
+    np.testing.assert_allclose(solver.populations(times), expected, rtol=1e-9, atol=1e-6)
+
+
+def test_atoms_are_conserved_through_the_sink():
+    tree = Tree()
+    solver = BatemanSolver(tree.build_tree("U", 92, 238, dag=True), initial_atoms=1e20)
+    populations = solver.populations(np.logspace(0, 18, 25))
+    np.testing.assert_allclose(populations.sum(axis=1), 1e20, rtol=1e-12)
+
+
+def test_secular_equilibrium_of_u238_and_th234():
+    tree = Tree()
+    solver = BatemanSolver(tree.build_tree("U", 92, 238, dag=True), initial_atoms=1e20)
+    activities = solver.activities([10 * YEAR])[0]
+    u238, th234 = solver.labels.index("U-238"), solver.labels.index("Th-234")
+    assert activities[th234] == pytest.approx(activities[u238], rel=1e-6)
+
+
+def test_missing_half_life_of_a_decaying_nuclide_raises():
+    root = TreeNode("Es", 99, 254, 1)
+    root.set_child(ALPHA, TreeNode("Bk", 97, 250, 2))
+    with pytest.raises(ValueError, match="Es-254"):
+        DecayChain(root)
+    chain = DecayChain(root, half_lives={(99, 254): 275.7 * DAY, (97, 250): float("inf")})
+    assert chain.decay_constants[1] == 0.0                  # the end of the chain may be stable
+
+
+def test_partial_branching_sends_the_rest_to_the_sink():
+    root = two_member_chain()
+    chain = DecayChain(root, branching={((88, 226), (86, 222)): 0.75})
+    assert chain.fractions[1, 0] == 0.75
+    assert chain.fractions[2, 0] == pytest.approx(0.25)
+    with pytest.raises(ValueError, match="more than 1"):
+        DecayChain(root, branching={((88, 226), (86, 222)): 1.5})
+
+
+def test_unsupported_root_is_rejected_with_its_missing_half_lives():
+    tree = Tree()
+    root = tree.build_tree("Lr", 103, 251, dag=True)
+    missing = missing_half_lives(root)
+    assert "Lr-251" in missing
+    with pytest.raises(ValueError, match="decay chain of Lr-251 is not supported"):
+        BatemanSolver(root)
+    half_lives = {(tree.nodes[key].value.atomic_number.value, tree.nodes[key].value.mass_number.value): YEAR
+                  for key in tree.nodes}
+    assert missing_half_lives(root, half_lives) == []
+
+
+@pytest.mark.parametrize("nuclide", [("Rn", 86, 222), ("Po", 84, 218), ("Np", 93, 237), ("Am", 95, 243)])
+def test_natural_series_roots_are_supported(nuclide):
+    tree = Tree()
+    root = tree.build_tree(*nuclide, dag=True)
+    assert missing_half_lives(root) == []
+    populations = BatemanSolver(root, initial_atoms=1e20).populations(np.logspace(-6, 18, 100))
+    assert populations.min() >= 0.0
+    np.testing.assert_allclose(populations.sum(axis=1), 1e20, rtol=1e-12)
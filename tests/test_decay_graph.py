@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+from decay_graph import load_graph, save_graph
+from decay_modes import DEFAULT_MODES, DecayMode
+from decay_tree import Tree
+
+ROOTS = [("U", 92, 238), ("Cf", 98, 252), ("Fm", 100, 257)]
+
+
+def levels(tree, root):
+    return [None if value is None else (value.symbol.value, value.atomic_number.value, value.mass_number.value,
+                                        value.binding_energy.value)
+            for value in tree.levelorder(root)]
+
+
+def dot_text(write_dot, root):
+    out = io.StringIO()
+    write_dot(root, out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("dag", [False, True])
+@pytest.mark.parametrize("nuclide", ROOTS)
+def test_round_trip(tmp_path, nuclide, dag):
+    tree = Tree()
+    root = tree.build_tree(*nuclide, dag=dag)
+    filepath = tmp_path / "graph.bin"
+    nodes, _ = save_graph(root, filepath)
+    graph = load_graph(filepath)
+
+    assert len(graph) == nodes
+    assert graph.levelorder() == levels(tree, root)
+    for objective in ("final_be", "fewest_steps", "max_q"):
+        tree.reset_path()              # DecayGraph only highlights the latest path
+        path = [(node.value.atomic_number.value, node.value.mass_number.value)
+                for node in tree.find_optimal_path(root, objective)]
+        assert [(int(graph.z[node]), int(graph.a[node])) for node in graph.find_optimal_path(objective=objective)] \
+            == path
+        assert dot_text(graph.write_dot, None) == dot_text(tree.write_dot, root)
+        assert graph.visualize_tree().source == tree.visualize_tree(root).source
+
+
+def test_long_labels_are_not_truncated(tmp_path):
+    modes = DEFAULT_MODES.register(DecayMode("cluster_o20", "20O cluster", -8, -20, "Oxygen-20 Cluster Emission",
+                                             emitted=(8, 20)))
+    tree = Tree(modes=modes)
+    root = tree.build_tree("Th", 90, 232, dag=True)
+    save_graph(root, tmp_path / "graph.bin", modes)
+    assert load_graph(tmp_path / "graph.bin").labels == modes.labels
+
+
+def test_other_files_are_rejected(tmp_path):
+    filepath = tmp_path / "graph.bin"
+    filepath.write_bytes(b"not a decay graph" * 8)
+    with pytest.raises(ValueError):
+        load_graph(filepath)
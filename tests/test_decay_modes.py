@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from decay_modes import BETA_PLUS_DECAY, DEFAULT_MODES, POSITRON_THRESHOLD, DecayMode, DecayModeRegistry
+from decay_tree import Tree
+from q_values import QValueTable
+
+CAPTURE = DecayModeRegistry.with_modes("electron_capture")
+
+
+def nodes(root):
+    # every distinct node of a tree or DAG
+    stack, seen = [root], {}
+    while stack:
+        node = stack.pop()
+        if id(node) not in seen:
+            seen[id(node)] = node
+            stack.extend(child for child in node.children if child is not None)
+    return list(seen.values())
+
+
+@pytest.mark.parametrize("dag", [False, True])
+@pytest.mark.parametrize("nuclide", [("No", 102, 255), ("Lr", 103, 251)])
+def test_no_parent_has_two_children_with_the_same_daughter(nuclide, dag):
+    tree = Tree(modes=CAPTURE)
+    captures = 0
+    for node in nodes(tree.build_tree(*nuclide, dag=dag)):
+        daughters = [(child.value.atomic_number.value, child.value.mass_number.value) for child in node.children
+                     if child is not None]
+        assert len(set(daughters)) == len(daughters)
+        captures += node.child(CAPTURE.index["electron_capture"]) is not None
+    assert captures > 0
+
+
+def test_capture_and_beta_plus_split_the_decays_by_energy():
+    table = QValueTable(CAPTURE)
+    beta_plus, capture = CAPTURE.index["beta_plus"], CAPTURE.index["electron_capture"]
+    q_ec = table.q[capture]                     # no positron to pay for: Q of electron capture
+    assert np.all(q_ec[table.allowed[beta_plus]] > POSITRON_THRESHOLD)
+    assert np.all((q_ec[table.allowed[capture]] > 0) & (q_ec[table.allowed[capture]] <= POSITRON_THRESHOLD))
+    assert table.allowed[capture].any()
+
+
+def test_default_beta_plus_is_unchanged():
+    assert DEFAULT_MODES[2] is BETA_PLUS_DECAY
+    assert CAPTURE[2] is not BETA_PLUS_DECAY and CAPTURE[2].label == BETA_PLUS_DECAY.label
+
+
+def test_overlapping_modes_are_rejected():
+    modes = DEFAULT_MODES.register(DecayMode("capture_any", "EC", -1, 0, "Electron Capture"))
+    with pytest.raises(ValueError, match="both allow the same decays"):
+        QValueTable(modes)
@@ -0,0 +1,114 @@
+import pytest
+
+from decay_tree import ElementList
+
+# U-238 down to Pb-206, with repeated symbols so the per-symbol index holds several slots
+PATH = [("U", 92, 238), ("Th", 90, 234), ("Pa", 91, 234), ("U", 92, 234), ("Th", 90, 230), ("Ra", 88, 226),
+        ("Rn", 86, 222), ("Po", 84, 218), ("Pb", 82, 214), ("Bi", 83, 214), ("Po", 84, 214), ("Pb", 82, 210),
+        ("Bi", 83, 210), ("Po", 84, 210), ("Pb", 82, 206)]
+
+
+def build(path=PATH):
+    elements = ElementList()
+    for symbol, atomic_no, mass_no in path:
+        elements.addnode(symbol, atomic_no, mass_no, binding_energy=0.0)
+    return elements, [list(nuclide) for nuclide in path]
+
+
+def delete(reference, symbol):
+    # the plain-list meaning of delnode: drop the first entry with that symbol
+    del reference[[entry[0] for entry in reference].index(symbol)]
+
+
+def check(elements, reference):
+    assert len(elements) == len(reference)
+    assert [[node.element, node.atomic_no, node.mass_no] for node in elements] == reference
+    for i, entry in enumerate(reference):
+        assert [elements[i].element, elements[i].atomic_no, elements[i].mass_no] == entry
+    assert elements.head is (elements[0] if reference else None)
+    assert elements.tail is (elements[len(reference) - 1] if reference else None)
+
+
+@pytest.mark.parametrize("symbol", ["U", "Ra", "Pb"])     # the head, the middle and the tail (first Pb: Pb-214)
+def test_delete_matches_a_list(symbol):
+    elements, reference = build()
+    elements.delnode(symbol)
+    delete(reference, symbol)
+    check(elements, reference)
+
+
+def test_delete_the_last_node():
+    elements, reference = build()
+    for symbol in ["Pb", "Pb", "Pb"]:
+        elements.delnode(symbol)
+        delete(reference, symbol)
+    assert elements.tail.element == "Po"
+    check(elements, reference)
+
+
+def test_repeated_deletes_without_compacting():
+    elements, reference = build()
+    for symbol in ["Po", "U", "Po", "Pb", "Th", "Po", "U"]:
+        elements.delnode(symbol)             # no indexing in between, so the slots are only marked empty
+        delete(reference, symbol)
+    check(elements, reference)
+
+
+def test_delete_everything():
+    elements, _ = build()
+    for symbol, _, _ in PATH:
+        elements.delnode(symbol)
+    check(elements, [])
+    with pytest.raises(ValueError):
+        elements[0]
+
+
+def test_delete_unknown_symbol_leaves_the_list_alone(capsys):
+    elements, reference = build()
+    elements.delnode("Fm")
+    assert "not in list" in capsys.readouterr().out
+    check(elements, reference)
+
+
+def test_setitem_then_delete_uses_the_new_symbol():
+    elements, reference = build()
+    elements[3] = "Ra"                       # U-234's slot now holds Ra, ahead of Ra-226
+    reference[3][0] = "Ra"
+    check(elements, reference)
+    elements.delnode("Ra")
+    delete(reference, "Ra")
+    check(elements, reference)
+    elements.delnode("U")                    # only U-238 is left under U
+    delete(reference, "U")
+    check(elements, reference)
+    assert "U" not in [node.element for node in elements]
+
+
+def test_setitem_after_compaction():
+    elements, reference = build()
+    elements.delnode("Th")
+    delete(reference, "Th")
+    elements[len(reference) - 1] = "Hg"      # indexing compacts first, so the position is the compacted one
+    reference[-1][0] = "Hg"
+    check(elements, reference)
+    elements.delnode("Hg")
+    delete(reference, "Hg")
+    check(elements, reference)
+
+
+def test_append_after_delete():
+    elements, reference = build()
+    elements.delnode("Ra")
+    delete(reference, "Ra")
+    elements.addnode("Ra", 88, 222, binding_energy=0.0)
+    reference.append(["Ra", 88, 222])
+    elements.delnode("Ra")
+    delete(reference, "Ra")
+    check(elements, reference)
+
+
+@pytest.mark.parametrize("key", [-1, len(PATH)])
+def test_index_out_of_bounds(key):
+    elements, _ = build()
+    with pytest.raises(ValueError, match="out of bounds"):
+        elements[key]
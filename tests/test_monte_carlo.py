@@ -0,0 +1,32 @@
+import numpy as np
+
+from bateman import YEAR, BatemanSolver
+from decay_tree import Tree
+from monte_carlo import MonteCarloSimulation
+
+
+def build(symbol, atomic_number, mass_number):
+    tree = Tree()
+    return tree.build_tree(symbol, atomic_number, mass_number, dag=True)
+
+
+def test_agrees_with_bateman():
+    root = build("U", 92, 238)
+    times = np.array([1e8, 1e9, 5e9]) * YEAR
+    n_atoms = 200_000
+    simulated = MonteCarloSimulation(root).run(n_atoms, times, seed=1, processes=1)
+    expected = BatemanSolver(root, initial_atoms=n_atoms).populations(times)
+    assert simulated.shape == expected.shape
+    # within 5 standard deviations of the binomial counts
+    tolerance = 5 * np.sqrt(np.maximum(expected * (1 - expected / n_atoms), 1.0))
+    assert np.all(np.abs(simulated - expected) <= tolerance)
+
+
+def test_atoms_are_conserved_and_shards_are_reproducible():
+    root = build("Th", 90, 232)
+    times = np.array([1e9, 1e10, 1e11]) * YEAR
+    simulation = MonteCarloSimulation(root)
+    first = simulation.run(50_000, times, seed=7, processes=1, shard_size=10_000)
+    second = simulation.run(50_000, times, seed=7, processes=2, shard_size=10_000)
+    assert np.all(first.sum(axis=1) == 50_000)
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,43 @@
+import pytest
+
+from decay_tree import Tree
+
+ROOTS = [("U", 92, 238), ("Th", 90, 232), ("Cf", 98, 252), ("Fm", 100, 257)]
+OBJECTIVES = ["final_be", "fewest_steps", "max_q"]
+
+
+def all_paths(root):
+    # every root-to-leaf path as a list of (node, mode of the step into it)
+    paths = []
+    stack = [[(root, None)]]
+    while stack:
+        path = stack.pop()
+        node = path[-1][0]
+        children = [(child, mode) for mode, child in enumerate(node.children) if child is not None]
+        if not children:
+            paths.append(path)
+        stack.extend(path + [step] for step in children)
+    return paths
+
+
+def score(tree, path, objective):
+    if objective == "final_be":
+        return path[-1][0].value.binding_energy.value
+    if objective == "fewest_steps":
+        return -(len(path) - 1)
+    return sum(tree.qvalues.q_value(parent.value.atomic_number.value, parent.value.mass_number.value, mode)
+               for (parent, _), (_, mode) in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("dag", [False, True])
+@pytest.mark.parametrize("objective", OBJECTIVES)
+@pytest.mark.parametrize("nuclide", ROOTS)
+def test_matches_brute_force(nuclide, objective, dag):
+    tree = Tree()
+    root = tree.build_tree(*nuclide, dag=dag)
+    found = tree.find_optimal_path(root, objective)
+
+    paths = all_paths(root)
+    best = max(score(tree, path, objective) for path in paths)
+    path = next(path for path in paths if [node for node, _ in path] == found)
+    assert score(tree, path, objective) == pytest.approx(best)
@@ -0,0 +1,75 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from decay_modes import DecayModeRegistry
+from decay_tree import Tree
+from parallel_build import build_tree_parallel, warm_worker
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(2, initializer=warm_worker) as pool:
+        yield pool
+
+
+def serial(tree, root):
+    levels = [None if value is None else (value.symbol.value, value.atomic_number.value, value.mass_number.value,
+                                          value.binding_energy.value)
+              for value in tree.levelorder(root)]
+    paths = []
+    for objective in ("final_be", "fewest_steps", "max_q"):
+        tree.reset_path()              # DecayGraph only highlights the latest path
+        paths.append([node.node_id for node in tree.find_optimal_path(root, objective)])
+    dot = io.StringIO()
+    tree.write_dot(root, dot)
+    return levels, paths, dot.getvalue(), tree.node_counter
+
+
+def parallel(graph):
+    paths = [[int(graph.node_id[node]) for node in graph.find_optimal_path(objective=objective)]
+             for objective in ("final_be", "fewest_steps", "max_q")]
+    dot = io.StringIO()
+    graph.write_dot(None, dot)
+    return graph.levelorder(), paths, dot.getvalue(), len(graph)
+
+
+@pytest.mark.parametrize("split_depth", [1, 3, 6, 50])
+@pytest.mark.parametrize("dag", [False, True])
+@pytest.mark.parametrize("nuclide", [("U", 92, 238), ("Cf", 98, 252), ("Fm", 100, 257), ("Lr", 103, 251)])
+def test_matches_build_tree(pool, nuclide, dag, split_depth):
+    tree = Tree()
+    root = tree.build_tree(*nuclide, dag=dag)
+    graph = build_tree_parallel(Tree(), *nuclide, dag=dag, split_depth=split_depth, pool=pool)
+    assert parallel(graph) == serial(tree, root)
+
+
+@pytest.mark.parametrize("split_depth", [2, 4])
+def test_matches_build_tree_with_extra_modes(pool, split_depth):
+    modes = DecayModeRegistry.with_modes("electron_capture", "cluster_c14")
+    tree = Tree(modes=modes)
+    root = tree.build_tree("Fm", 100, 257, dag=True)
+    graph = build_tree_parallel(Tree(modes=modes), "Fm", 100, 257, dag=True, split_depth=split_depth, pool=pool)
+    assert parallel(graph) == serial(tree, root)
+
+
+def test_settings_come_from_the_template_tree(pool):
+    tree = Tree(z_min=90)
+    root = tree.build_tree("No", 102, 255)
+    template = Tree(z_min=90)
+    graph = build_tree_parallel(template, "No", 102, 255, split_depth=3, pool=pool)
+    assert parallel(graph) == serial(tree, root)
+    assert template.node_counter == 0
+
+
+@pytest.mark.parametrize("dag", [False, True])
+def test_depth_limit(pool, dag):
+    with pytest.raises(RuntimeError):
+        Tree(depth_limit=5).build_tree("Lr", 103, 251, dag=dag)
+    with pytest.raises(RuntimeError):
+        build_tree_parallel(Tree(depth_limit=5), "Lr", 103, 251, dag=dag, split_depth=2, pool=pool)
+
+
+def test_root_outside_region(pool):
+    assert build_tree_parallel(Tree(z_max=80), "U", 92, 238, pool=pool) is None
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service import QueryService
+
+PATH = "/path?symbol=U&z=92&a=238"
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    Thread pool that records every computation submitted to it. While gate is clear the computations wait.
+    """
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def submit(self, fn, *args):
+        self.calls.append(args)
+
+        def run():
+            self.gate.wait(timeout=30)
+            return fn(*args)
+        return super().submit(run)
+
+
+async def get(port, target, method="GET"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), body
+
+
+def run(test):
+    # runs test(service, executor, port) against a QueryService listening on a free port of 127.0.0.1
+    async def main():
+        executor = CountingExecutor()
+        service = QueryService(executor=executor)
+        server = await service.start("127.0.0.1", 0)
+        try:
+            await test(service, executor, server.sockets[0].getsockname()[1])
+        finally:
+            executor.gate.set()
+            server.close()
+            await server.wait_closed()
+            service.close()
+    asyncio.run(main())
+
+
+def test_answers():
+    async def test(service, executor, port):
+        status, body = await get(port, PATH + "&dag=1&objective=fewest_steps")
+        assert status == 200
+        result = json.loads(body)
+        assert result["path"][0][:3] == ["U", 92, 238]
+        status, body = await get(port, "/tree?symbol=U&z=92&a=238")
+        assert status == 200 and json.loads(body)["nodes"][0][1:4] == ["U", 92, 238]
+        status, body = await get(port, "/dot?symbol=U&z=92&a=238&q_labels=1")
+        assert status == 200 and body.startswith(b"digraph {")
+        status, body = await get(port, "/stats")
+        assert status == 200 and json.loads(body)["misses"] == 3
+    run(test)
+
+
+@pytest.mark.parametrize("target, status", [
+    (PATH + "&objective=shortest", 400),         # unknown objective
+    (PATH + "&dag=yes", 400),
+    (PATH + "&modes=fission", 400),
+    ("/path?symbol=U&z=92", 400),                # no mass number
+    ("/path?symbol=U&z=92&a=300", 404),          # unknown nuclide
+    ("/path?symbol=Th&z=92&a=238", 404),         # symbol of another element
+    ("/nuclides?symbol=U&z=92&a=238", 404),      # unknown endpoint
+])
+def test_bad_queries(target, status):
+    async def test(service, executor, port):
+        assert (await get(port, target))[0] == status
+        assert executor.calls == []              # rejected before any work
+    run(test)
+
+
+def test_only_get_is_supported():
+    async def test(service, executor, port):
+        assert (await get(port, PATH, method="POST"))[0] == 405
+    run(test)
+
+
+def test_repeated_query_is_served_from_the_cache():
+    async def test(service, executor, port):
+        first = await get(port, PATH)
+        second = await get(port, PATH + "&objective=final_be")   # the default, so the same cache key
+        assert first == second and first[0] == 200
+        assert len(executor.calls) == 1
+        assert service.stats()["hits"] == 1 and service.stats()["misses"] == 1
+        await get(port, PATH + "&objective=max_q")
+        assert len(executor.calls) == 2
+    run(test)
+
+
+def test_concurrent_identical_queries_compute_once():
+    async def test(service, executor, port):
+        executor.gate.clear()                    # hold the first computation until every request is in
+        requests = [asyncio.ensure_future(get(port, PATH)) for _ in range(5)]
+        for _ in range(1000):
+            if service.stats()["hits"] == 4:
+                break
+            await asyncio.sleep(0.01)
+        assert service.stats()["pending"] == 1
+        assert len(executor.calls) == 1
+        executor.gate.set()
+        responses = await asyncio.gather(*requests)
+        assert all(response == responses[0] for response in responses) and responses[0][0] == 200
+        assert len(executor.calls) == 1
+        assert service.stats()["pending"] == 0 and service.stats()["misses"] == 1
+    run(test)
@@ -0,0 +1,33 @@
+import pytest
+
+from decay_tree import Tree
+from transition_table import TransitionTable
+
+
+def nuclides(tree, root):
+    return [(value.atomic_number.value, value.mass_number.value) for value in tree.levelorder(root)
+            if value is not None]
+
+
+@pytest.mark.parametrize("dag", [False, True])
+@pytest.mark.parametrize("nuclide", [("Hg", 80, 206), ("Pb", 82, 210), ("U", 92, 238), ("Fm", 100, 257)])
+def test_table_builds_the_same_tree(nuclide, dag):
+    plain, tabled = Tree(), Tree(transitions=TransitionTable())
+    assert nuclides(tabled, tabled.build_tree(*nuclide, dag=dag)) == nuclides(plain, plain.build_tree(*nuclide,
+                                                                                                     dag=dag))
+
+
+@pytest.mark.parametrize("nuclide", [("Hg", 80, 206), ("Pb", 82, 210)])
+def test_table_over_a_wider_region(nuclide):
+    plain = Tree(z_min=70)
+    expected = nuclides(plain, plain.build_tree(*nuclide, dag=True))
+    assert min(z for z, _ in expected) < 80                 # the chain does leave the default window
+    for transitions in (TransitionTable(70, 103), TransitionTable(0, 118)):
+        tabled = Tree(z_min=70, transitions=transitions)
+        assert nuclides(tabled, tabled.build_tree(*nuclide, dag=True)) == expected
+
+
+@pytest.mark.parametrize("region", [{"z_min": 70}, {"z_max": 110}, {"z_min": 60, "z_max": 110}])
+def test_table_not_covering_the_region_is_rejected(region):
+    with pytest.raises(ValueError, match="covers Z 80-103"):
+        Tree(transitions=TransitionTable(), **region)
@@ -0,0 +1,73 @@
+import numpy as np
+
+from decay_modes import DEFAULT_MODES
+from nuclide_index import get_index
+from q_values import get_table
+
+
+class TransitionTable:
+    """
+    Every transition of the nuclide chart inside a Z window, for every mode of a DecayModeRegistry (by default
+    alpha, beta minus and beta plus), computed at once.
+
+    The Z and A arrays of all known nuclides are shifted by each mode's (ΔZ, ΔA); daughters that fall outside the
+    window, or that the QValueTable does not allow (unknown to periodictable, or rejected by the mode's filter, by
+    default binding energy per nucleon not higher than the parent's), are masked out. What is left is a flat edge
+    list sorted by parent and then by mode:
+        parent_z, parent_a, child_z, child_a, mode   (NumPy int arrays, mode is the registry index)
+        q                                            (Q value of each edge in MeV)
+
+    These are exactly the children Tree.build_tree derives one at a time with find_element and
+    compare_calculate_mass_defect, so a Tree given this table only has to walk existing edges.
+    """
+    def __init__(self, z_min=80, z_max=103, modes=None):
+        index = get_index()
+        self.z_min = z_min
+        self.z_max = z_max
+        self.modes = DEFAULT_MODES if modes is None else modes
+
+        z, a = np.nonzero(index.exists)
+        in_window = (z >= z_min) & (z <= z_max)
+        z, a = z[in_window], a[in_window]
+
+        qvalues = get_table(self.modes)
+        edges = []
+        for mode, decay in enumerate(self.modes):
+            cz, ca = z + decay.dz, a + decay.da
+            keep = (cz >= z_min) & (cz <= z_max) & qvalues.allowed[mode, z, a]
+            edges.append((z[keep], a[keep], cz[keep], ca[keep], np.full(keep.sum(), mode)))
+
+        parent_z, parent_a, child_z, child_a, modes = (np.concatenate(column) for column in zip(*edges))
+        order = np.lexsort((modes, parent_a, parent_z))
+        self.parent_z = parent_z[order]
+        self.parent_a = parent_a[order]
+        self.child_z = child_z[order]
+        self.child_a = child_a[order]
+        self.mode = modes[order]
+        self.q = qvalues.q[self.mode, self.parent_z, self.parent_a]
+
+        # (Z, A, mode) -> (symbol, Z, A) of the daughter, for O(1) lookups while walking a tree
+        self._daughters = {}
+        for pz, pa, cz, ca, mode in zip(self.parent_z.tolist(), self.parent_a.tolist(), self.child_z.tolist(),
+                                        self.child_a.tolist(), self.mode.tolist()):
+            self._daughters[(pz, pa, mode)] = (index.symbols[cz], cz, ca)
+
+    def __len__(self):
+        return len(self.mode)
+
+    def daughter(self, atomic_number, mass_number, mode):
+        """
+        Returns (symbol, Z, A) of the daughter reached from (Z, A) by the given mode, or None if that decay
+        is not allowed.
+        Time Complexity: O(1)
+        """
+        return self._daughters.get((atomic_number, mass_number, mode))
+
+    def edges(self):
+        """
+        Returns the edge list as Python tuples (parent Z, parent A, child Z, child A, mode label).
+        """
+        labels = self.modes.labels
+        return [(pz, pa, cz, ca, labels[mode]) for pz, pa, cz, ca, mode in
+                zip(self.parent_z.tolist(), self.parent_a.tolist(), self.child_z.tolist(), self.child_a.tolist(),
+                    self.mode.tolist())]
@@ -1,13 +1,11 @@
-import periodictable
-import sys
-import time
-import graphviz
+import argparse
+from decay_modes import DEFAULT_MODES
+from nuclide_index import get_index
+from metrics import Metrics
+from render_cache import RenderCache
 
-# Increase recursion limit
-sys.setrecursionlimit(10000)
-
-# Define maximum recursion depth
-MAX_RECURSION_DEPTH = 1000
+# Define maximum decay chain depth; the builder walks an explicit stack, so this is the only limit
+MAX_DEPTH = 1000
 
 # Basic node structure of a graph
 class GraphNode:
@@ -17,17 +15,25 @@ class GraphNode:
 
 # Declaration of a graph class
 class NuclearGraph:
-    def __init__(self):
+    def __init__(self, metrics=None, modes=None):
         self.root = None
+        self.modes = DEFAULT_MODES if modes is None else modes   # decay_modes.DecayModeRegistry
         self.max_depth = 0  # Initialize maximum recursion depth
-        self.byproducts = set()
+        self.byproducts = set()   # (Z, A) of every product already added
+        self.metrics = None  # optional metrics.Metrics, see enable_metrics
+        if metrics is not None:
+            self.enable_metrics(metrics)
+
+    def enable_metrics(self, metrics):
+        # wraps the timed methods on this instance only; graphs without metrics run the plain methods
+        self.metrics = metrics
+        for method, phase in (("find_element", "lookup"), ("build_decay_tree", "build"),
+                              ("create_dot_graph", "dot")):
+            metrics.instrument(self, method, phase)
 
     def find_element(self, atomic_number, mass_number):
-        element = periodictable.elements[atomic_number]
-        for i in element:
-            if str(i)[:3] == str(mass_number):
-                return i
-        return None
+        # symbol of the nuclide from the shared nuclide index, None if the isotope is unknown
+        return get_index().find_element(atomic_number, mass_number)
 
     def alpha_decay(self, atomic_number, mass_number):
         return atomic_number - 2, mass_number - 4
@@ -39,96 +45,103 @@ class NuclearGraph:
         return atomic_number - 1, mass_number
 
     def build_decay_tree(self, element, atomic_number, mass_number, depth=0):
-        new_node = GraphNode(element, atomic_number, mass_number)
-        depth += 1
-
-        # Update maximum recursion depth
-        self.max_depth = max(self.max_depth, depth)
-
-        # Perform alpha decay
-        alpha_atomic_number, alpha_mass_number = self.alpha_decay(atomic_number, mass_number)
-        alpha_element = self.find_element(alpha_atomic_number, alpha_mass_number)
-        if alpha_element:
-            alpha_node = self.build_node("Alpha Decay", alpha_element, alpha_atomic_number, alpha_mass_number, depth)
-            if alpha_node:
-                if alpha_element not in self.byproducts:
-                    new_node.decay_products.append(alpha_node)
-                    self.byproducts.add(alpha_element)
-                    self.build_decay_tree(alpha_element, alpha_atomic_number, alpha_mass_number, depth)
-
-        # Perform beta-minus decay
-        beta_minus_atomic_number, beta_minus_mass_number = self.beta_minus_decay(atomic_number, mass_number)
-        beta_minus_element = self.find_element(beta_minus_atomic_number, beta_minus_mass_number)
-        if beta_minus_element:
-            beta_minus_node = self.build_node("Beta-Minus Decay", beta_minus_element, beta_minus_atomic_number,
-                                              beta_minus_mass_number, depth)
-            if beta_minus_node:
-                if beta_minus_element not in self.byproducts:
-                    new_node.decay_products.append(beta_minus_node)
-                    self.byproducts.add(beta_minus_element)
-                    self.build_decay_tree(beta_minus_element, beta_minus_atomic_number, beta_minus_mass_number, depth)
-
-        # Perform beta-plus decay
-        beta_plus_atomic_number, beta_plus_mass_number = self.beta_plus_decay(atomic_number, mass_number)
-        beta_plus_element = self.find_element(beta_plus_atomic_number, beta_plus_mass_number)
-        if beta_plus_element:
-            beta_plus_node = self.build_node("Beta-Plus Decay", beta_plus_element, beta_plus_atomic_number,
-                                             beta_plus_mass_number, depth)
-            if beta_plus_node:
-                if beta_plus_element not in self.byproducts:
-                    new_node.decay_products.append(beta_plus_node)
-                    self.byproducts.add(beta_plus_element)
-                    self.build_decay_tree(beta_plus_element, beta_plus_atomic_number, beta_plus_mass_number, depth)
-
-        return new_node
+        # Depth first over an explicit stack. A frame holds the node being expanded and the next decay mode to
+        # try, so each product is fully explored before its parent's next decay mode, as in the recursive version
+        decays = self.modes.modes
+
+        root = GraphNode(element, atomic_number, mass_number)
+        self.max_depth = max(self.max_depth, depth + 1)
+        stack = [[root, atomic_number, mass_number, depth + 1, 0]]
+
+        while stack:
+            frame = stack[-1]
+            new_node, a_num, mass_num, node_depth, mode = frame
+            if mode == len(decays):
+                stack.pop()
+                continue
+            frame[4] += 1
+
+            decay = decays[mode]
+            product_atomic_number, product_mass_number = decay.daughter(a_num, mass_num)
+            if decay.allowed is not None and not decay.allowed(a_num, mass_num, product_atomic_number,
+                                                               product_mass_number):
+                continue
+            product_element = self.find_element(product_atomic_number, product_mass_number)
+            if product_element:
+                product_node = self.build_node(decay.title, product_element, product_atomic_number, product_mass_number,
+                                               node_depth)
+                if product_node:
+                    if (product_atomic_number, product_mass_number) in self.byproducts:
+                        if self.metrics is not None:
+                            self.metrics.count("duplicates")
+                    else:
+                        new_node.decay_products.append(product_node)
+                        self.byproducts.add((product_atomic_number, product_mass_number))
+
+                        if node_depth + 1 > MAX_DEPTH:
+                            raise RuntimeError(f"Decay chain of {element}-{mass_number} is deeper than {MAX_DEPTH}")
+                        # Update maximum depth
+                        self.max_depth = max(self.max_depth, node_depth + 1)
+                        if self.metrics is not None:
+                            self.metrics.count("nodes_created")
+                            self.metrics.maximum("max_depth", node_depth + 1)
+                        stack.append([GraphNode(product_element, product_atomic_number, product_mass_number),
+                                      product_atomic_number, product_mass_number, node_depth + 1, 0])
+
+        return root
 
     def build_node(self, decay_type, element, atomic_number, mass_number, depth):
-        return GraphNode(decay_type + " " + element.symbol, atomic_number, mass_number)
+        return GraphNode(decay_type + " " + element, atomic_number, mass_number)
 
     def get_max_recursion_depth(self):
         return self.max_depth
 
     def create_dot_graph(self, root):
+        import graphviz                  # only needed when a graph is actually drawn
+
         dot = graphviz.Digraph()
         
-        def add_edges_to_graph(node):
+        stack = [(root, None)]                              # node, parent it decayed from
+        while stack:
+            node, parent = stack.pop()
             if node is None:
-                return
+                continue
+            if parent is not None:
+                dot.edge(str(parent.value), str(node.value))
             dot.node(str(node.value), label=str(node.value))
-            for product in node.decay_products:
-                dot.edge(str(node.value), str(product.value))
-                add_edges_to_graph(product)
+            for product in reversed(node.decay_products):   # pre-order, first product drawn first
+                stack.append((product, node))
 
-        add_edges_to_graph(root)
         return dot
 
 
-# Main
-graph = NuclearGraph()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Draw the U-238 decay graph to decay_process_graph.pdf")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of using the render cache")
+    parser.add_argument("--cache-dir", help="render cache directory (default: .render_cache or $RENDER_CACHE_DIR)")
+    args = parser.parse_args(argv)
 
-# Start the timer
-start_time = time.time()
+    metrics = Metrics()
+    graph = NuclearGraph(metrics)
 
-# Build the decay tree representing the decay process
-root = graph.build_decay_tree('U', 92, 238)  # Uranium-238 decay
+    # Build the decay tree representing the decay process
+    root = graph.build_decay_tree('U', 92, 238)  # Uranium-238 decay
 
-# End the timer
-end_time = time.time()
+    # Display the maximum recursion depth and time taken
+    print("Maximum Recursion Depth:", graph.get_max_recursion_depth())
+    print("Time taken to build the graph:", metrics.phases["build"] * 1000, "milliseconds")
 
-# Calculate the time taken
-time_taken = (end_time - start_time) * 1000  # Convert to milliseconds
+    # Create Graphviz graph
+    dot = graph.create_dot_graph(root)
 
-# Get the maximum recursion depth
-max_depth = graph.get_max_recursion_depth()
+    # Save the graph as a PDF file
+    with metrics.phase("render"):
+        RenderCache(args.cache_dir, enabled=not args.no_cache).render(dot, "decay_process_graph", format="pdf")
 
-# Display the maximum recursion depth and time taken
-print("Maximum Recursion Depth:", max_depth)
-print("Time taken to build the graph:", time_taken, "milliseconds")
+    print("Graph visualization saved as 'decay_process_graph.pdf'")
+    print(metrics.summary())
 
-# Create Graphviz graph
-dot = graph.create_dot_graph(root)
 
-# Save the graph as a PDF file
-dot.render("decay_process_graph", format="pdf", cleanup=True)
-
-print("Graph visualization saved as 'decay_process_graph.pdf'")
+# Main
+if __name__ == "__main__":
+    main()